@@ -7,10 +7,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from flask import Flask, render_template
 from flask_cors import CORS
 from backend.config.config import config
+from backend.config.database import Database
 from backend.routes.auth_routes import auth_bp
 from backend.routes.concern_routes import concern_bp
 from backend.routes.user_routes import user_bp
 from backend.utils.email_service import init_mail
+from backend.utils.json_provider import OrjsonProvider
+from backend.utils.metrics import init_metrics
+from backend.utils.query_stats import init_query_stats
 
 def create_app(config_name='default'):
     """Application factory pattern"""
@@ -20,13 +24,17 @@ def create_app(config_name='default'):
                 static_folder='../frontend/static')
     app.config.from_object(config[config_name])
     
+    # Faster serialization for the large concern lists
+    if app.config['FAST_JSON']:
+        app.json = OrjsonProvider(app)
+    
     # Enable CORS
     CORS(app, resources={
         r"/api/*": {
             "origins": "*",  # Allow all origins in development
             "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
             "allow_headers": ["Content-Type", "Authorization"],
-            "expose_headers": ["Content-Type", "Authorization"],
+            "expose_headers": ["Content-Type", "Authorization", "Content-Disposition"],
             "supports_credentials": True,
             "max_age": 3600
         }
@@ -35,6 +43,10 @@ def create_app(config_name='default'):
     # Initialize Flask-Mail
     init_mail(app)
     
+    # Count queries per request (Server-Timing header, slow-query log, /metrics)
+    init_query_stats(app)
+    init_metrics(app)
+    
     # Create upload folder if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
@@ -46,7 +58,11 @@ def create_app(config_name='default'):
     # Health check route
     @app.route('/api/health')
     def health_check():
-        return {'status': 'healthy', 'message': 'Grievance System API is running'}, 200
+        return {
+            'status': 'healthy',
+            'message': 'Grievance System API is running',
+            'database_pool': Database.pool_stats()
+        }, 200
     
     # Frontend routes
     @app.route('/')
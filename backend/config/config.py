@@ -14,10 +14,22 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'postgres')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     
+    # Connection pool (per process; size DB_POOL_MAX * workers below Postgres max_connections)
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 1))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))  # seconds to wait for a free connection
+    DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', 30))  # ping connections idle longer than this
+    DB_STREAM_BATCH_SIZE = int(os.getenv('DB_STREAM_BATCH_SIZE', 500))  # rows per fetch for streamed exports
+    
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))
     
+    # Password hashing (bcrypt); calibrate BCRYPT_ROUNDS with scripts/bench_login.py
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))  # cost factor; logins rehash older hashes to it
+    BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', os.cpu_count() or 1))  # hashes run at once per process
+    BCRYPT_MAX_QUEUE = int(os.getenv('BCRYPT_MAX_QUEUE', 32))  # waiting hashes before logins get 503
+    
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:5000,http://localhost:3000,http://127.0.0.1:5000').split(',')
     
@@ -30,6 +42,12 @@ class Config:
     GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', '')
     GOOGLE_CLIENT_SECRET = os.getenv('GOOGLE_CLIENT_SECRET', '')
     GOOGLE_REDIRECT_URI = os.getenv('GOOGLE_REDIRECT_URI', 'http://localhost:5000/api/auth/google/callback')
+    # Google endpoints (point these at scripts/stub_google_oauth.py to test without Google)
+    GOOGLE_AUTH_URL = os.getenv('GOOGLE_AUTH_URL', 'https://accounts.google.com/o/oauth2/v2/auth')
+    GOOGLE_TOKEN_URL = os.getenv('GOOGLE_TOKEN_URL', 'https://oauth2.googleapis.com/token')
+    GOOGLE_CERTS_URL = os.getenv('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+    GOOGLE_HTTP_TIMEOUT = float(os.getenv('GOOGLE_HTTP_TIMEOUT', 10))  # seconds per request to Google
+    GOOGLE_HTTP_POOL_SIZE = int(os.getenv('GOOGLE_HTTP_POOL_SIZE', 10))  # keep-alive connections per host
     
     # Email Configuration
     MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
@@ -40,6 +58,55 @@ class Config:
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD', '')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER', '')
     MAIL_ADMIN_EMAIL = os.getenv('MAIL_ADMIN_EMAIL', 'ssc@batstateu.edu.ph')
+    MAIL_MAX_MESSAGES_PER_CONNECTION = int(os.getenv('MAIL_MAX_MESSAGES_PER_CONNECTION', 100))  # then reconnect
+    MAIL_CONNECTION_IDLE_SECONDS = float(os.getenv('MAIL_CONNECTION_IDLE_SECONDS', 60))  # close idle worker connections
+    
+    # Query result caches
+    CACHE_SHARED = os.getenv('CACHE_SHARED', 'False') == 'True'  # invalidate across workers via cache_versions
+    STATS_CACHE_MAX_AGE = int(os.getenv('STATS_CACHE_MAX_AGE', 60))  # seconds
+    REFERENCE_CACHE_SHARED = os.getenv('REFERENCE_CACHE_SHARED', 'True') == 'True'  # categories/offices check cache_versions
+    REFERENCE_CACHE_MAX_AGE = int(os.getenv('REFERENCE_CACHE_MAX_AGE', 600))  # categories/offices, seconds
+    REFERENCE_CACHE_CHECK_INTERVAL = int(os.getenv('REFERENCE_CACHE_CHECK_INTERVAL', 5))  # shared version checks, seconds
+    REFERENCE_HTTP_MAX_AGE = int(os.getenv('REFERENCE_HTTP_MAX_AGE', 3600))  # browser cache for public lists, seconds
+    
+    # Serialize JSON responses with orjson (same output as Flask's default provider)
+    FAST_JSON = os.getenv('FAST_JSON', 'True') == 'True'
+    
+    # Query instrumentation: Server-Timing header and JSON log lines on stdout
+    SERVER_TIMING = os.getenv('SERVER_TIMING', 'True') == 'True'
+    SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', 200))  # log statements slower than this
+    QUERY_COUNT_LOG_THRESHOLD = int(os.getenv('QUERY_COUNT_LOG_THRESHOLD', 20))  # log requests making this many queries
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')  # bearer token required by GET /metrics when set
+    EMAIL_WORKER_METRICS_PORT = int(os.getenv('EMAIL_WORKER_METRICS_PORT', 0))  # 0 = don't serve worker metrics
+    
+    # Delta sync (GET /api/concerns/changes): re-read this many seconds before the
+    # client's cursor, since updated_at is stamped when a transaction starts
+    CONCERN_CHANGES_OVERLAP_SECONDS = int(os.getenv('CONCERN_CHANGES_OVERLAP_SECONDS', 30))
+    
+    # Notification push (SSE stream and long-poll)
+    NOTIFICATION_STREAM_MAX_SECONDS = int(os.getenv('NOTIFICATION_STREAM_MAX_SECONDS', 300))  # client reconnects after
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS = int(os.getenv('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', 15))
+    NOTIFICATION_POLL_MAX_SECONDS = int(os.getenv('NOTIFICATION_POLL_MAX_SECONDS', 30))
+    NOTIFICATION_MAX_WAITERS = int(os.getenv('NOTIFICATION_MAX_WAITERS', 4))  # parked streams/polls per process, keep below --threads
+    NOTIFICATION_TICKET_SECONDS = int(os.getenv('NOTIFICATION_TICKET_SECONDS', 60))  # lifetime of a ?ticket= for the stream
+    
+    # Email outbox (drained by `python -m backend.workers.email_worker`)
+    EMAIL_USE_OUTBOX = os.getenv('EMAIL_USE_OUTBOX', 'True') == 'True'
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 6))
+    EMAIL_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_RETRY_BASE_SECONDS', 30))  # doubles after each failure
+    EMAIL_RETRY_MAX_SECONDS = int(os.getenv('EMAIL_RETRY_MAX_SECONDS', 3600))
+    EMAIL_WORKER_BATCH_SIZE = int(os.getenv('EMAIL_WORKER_BATCH_SIZE', 20))
+    EMAIL_WORKER_POLL_INTERVAL = float(os.getenv('EMAIL_WORKER_POLL_INTERVAL', 5))
+    EMAIL_WORKER_LEASE_SECONDS = int(os.getenv('EMAIL_WORKER_LEASE_SECONDS', 300))
+    
+    # Background jobs (run by `python -m backend.workers.job_worker`)
+    JOB_USE_WORKER = os.getenv('JOB_USE_WORKER', 'True') == 'True'  # False: run handlers inline after commit
+    JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', 4))  # jobs run at once per worker
+    JOB_WORKER_POLL_INTERVAL = float(os.getenv('JOB_WORKER_POLL_INTERVAL', 2))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 300))  # a job still running after this is retried
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+    JOB_RETRY_BASE_SECONDS = int(os.getenv('JOB_RETRY_BASE_SECONDS', 10))  # doubles after each failure
+    JOB_RETRY_MAX_SECONDS = int(os.getenv('JOB_RETRY_MAX_SECONDS', 3600))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
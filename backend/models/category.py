@@ -1,27 +1,68 @@
+from backend.config.config import Config
 from backend.config.database import Database
+from backend.utils.cache import VersionedCache
+import hashlib
+
+# Categories and offices change a few times a semester but are read on every
+# submission, assignment and page load, so each process keeps the active rows.
+# A trigger on each table bumps its cache_versions row (named after the table)
+# on any edit, API or SQL, and every process checks it every
+# REFERENCE_CACHE_CHECK_INTERVAL seconds
+category_cache = VersionedCache('concern_categories', Config.REFERENCE_CACHE_MAX_AGE,
+                                shared=Config.REFERENCE_CACHE_SHARED,
+                                check_interval=Config.REFERENCE_CACHE_CHECK_INTERVAL)
+office_cache = VersionedCache('offices', Config.REFERENCE_CACHE_MAX_AGE,
+                              shared=Config.REFERENCE_CACHE_SHARED,
+                              check_interval=Config.REFERENCE_CACHE_CHECK_INTERVAL)
+
+def _load_reference(table, key, order_by, list_columns):
+    """Load the active rows of a reference table, indexed by id and fingerprinted"""
+    rows = Database.execute_query(
+        f"SELECT * FROM {table} WHERE is_active = true ORDER BY {order_by}",
+        fetch_all=True
+    )
+    listing = [{column: row[column] for column in list_columns} for row in rows]
+    return {
+        'list': listing,
+        'by_id': {row[key]: row for row in rows},
+        'version': hashlib.md5(repr(rows).encode('utf-8')).hexdigest()
+    }
+
+def _lookup(cache, loader, key):
+    """Find an active reference row by id in the cache (None for unknown or malformed ids)"""
+    try:
+        key = int(key)
+    except (TypeError, ValueError):
+        return None
+    row = cache.get(loader)['by_id'].get(key)
+    return dict(row) if row else None
 
 class Category:
     """Category model for database operations"""
     
+    @staticmethod
+    def _load():
+        return _load_reference('concern_categories', 'category_id', 'category_name',
+                               ('category_id', 'category_name', 'description', 'created_at'))
+    
     @staticmethod
     def get_all():
         """Get all active categories"""
-        query = """
-            SELECT category_id, category_name, description, created_at
-            FROM concern_categories
-            WHERE is_active = true
-            ORDER BY category_name
-        """
-        return Database.execute_query(query, fetch_all=True)
+        return [dict(row) for row in category_cache.get(Category._load)['list']]
     
     @staticmethod
-    def find_by_id(category_id):
-        """Find category by ID"""
-        query = """
-            SELECT * FROM concern_categories 
-            WHERE category_id = %s AND is_active = true
+    def get_version():
+        """Fingerprint of the active categories, used as the HTTP validator"""
+        return category_cache.get(Category._load)['version']
+    
+    @staticmethod
+    def find_by_id(category_id, conn=None):
+        """Find category by ID
+        
+        Served from the process cache; `conn` is accepted for callers inside a
+        transaction but not needed.
         """
-        return Database.execute_query(query, (category_id,), fetch_one=True)
+        return _lookup(category_cache, Category._load, category_id)
     
     @staticmethod
     def create(category_name, description=None):
@@ -31,7 +72,9 @@ class Category:
             VALUES (%s, %s, true)
             RETURNING category_id, category_name, description, created_at
         """
-        return Database.execute_query(query, (category_name, description), fetch_one=True)
+        category = Database.execute_query(query, (category_name, description), fetch_one=True)
+        category_cache.invalidate()
+        return category
     
     @staticmethod
     def update(category_id, category_name, description=None):
@@ -43,6 +86,8 @@ class Category:
             RETURNING category_id
         """
         result = Database.execute_query(query, (category_name, description, category_id), fetch_one=True)
+        if result:
+            category_cache.invalidate()
         return result is not None
     
     @staticmethod
@@ -54,49 +99,61 @@ class Category:
             FROM concerns
             WHERE category_id = %s
         """
-        result = Database.execute_query(check_query, (category_id,), fetch_one=True)
-        
-        if result and result['concern_count'] > 0:
-            return False  # Cannot delete category with associated concerns
+        with Database.transaction() as conn:
+            result = Database.execute_query(check_query, (category_id,), fetch_one=True, conn=conn)
+            
+            if result and result['concern_count'] > 0:
+                return False  # Cannot delete category with associated concerns
+            
+            # Soft delete
+            query = """
+                UPDATE concern_categories
+                SET is_active = false
+                WHERE category_id = %s
+                RETURNING category_id
+            """
+            result = Database.execute_query(query, (category_id,), fetch_one=True, conn=conn)
         
-        # Soft delete
-        query = """
-            UPDATE concern_categories
-            SET is_active = false
-            WHERE category_id = %s
-            RETURNING category_id
-        """
-        result = Database.execute_query(query, (category_id,), fetch_one=True)
+        # Invalidate after commit so a concurrent reload cannot cache the old rows
+        if result:
+            category_cache.invalidate()
         return result is not None
 
 class Office:
     """Office model for database operations"""
     
+    @staticmethod
+    def _load():
+        return _load_reference('offices', 'office_id', 'office_name',
+                               ('office_id', 'office_name', 'description', 'contact_email', 'contact_number'))
+    
     @staticmethod
     def get_all():
         """Get all active offices"""
-        query = """
-            SELECT office_id, office_name, description, contact_email, contact_number
-            FROM offices
-            WHERE is_active = true
-            ORDER BY office_name
-        """
-        return Database.execute_query(query, fetch_all=True)
+        return [dict(row) for row in office_cache.get(Office._load)['list']]
     
     @staticmethod
-    def find_by_id(office_id):
-        """Find office by ID"""
-        query = """
-            SELECT * FROM offices 
-            WHERE office_id = %s AND is_active = true
+    def get_version():
+        """Fingerprint of the active offices, used as the HTTP validator"""
+        return office_cache.get(Office._load)['version']
+    
+    @staticmethod
+    def find_by_id(office_id, conn=None):
+        """Find office by ID
+        
+        Served from the process cache; `conn` is accepted for callers inside a
+        transaction but not needed. Offices are edited outside the API; the
+        trigger on `offices` bumps its `cache_versions` row, so changes show
+        up within REFERENCE_CACHE_CHECK_INTERVAL seconds (REFERENCE_CACHE_MAX_AGE
+        with REFERENCE_CACHE_SHARED=False).
         """
-        return Database.execute_query(query, (office_id,), fetch_one=True)
+        return _lookup(office_cache, Office._load, office_id)
 
 class Notification:
     """Notification model for database operations"""
     
     @staticmethod
-    def create(user_id, concern_id, notification_type, title, message):
+    def create(user_id, concern_id, notification_type, title, message, conn=None):
         """Create a new notification"""
         query = """
             INSERT INTO notifications 
@@ -106,7 +163,17 @@ class Notification:
         """
         return Database.execute_query(query, 
                                      (user_id, concern_id, notification_type, title, message),
-                                     fetch_one=True)
+                                     fetch_one=True, conn=conn)
+    
+    @staticmethod
+    def create_many(notifications, conn=None):
+        """Create many (user_id, concern_id, notification_type, title, message) notifications in one insert"""
+        query = """
+            INSERT INTO notifications 
+            (user_id, concern_id, notification_type, title, message)
+            SELECT * FROM unnest(%s::int[], %s::int[], %s::text[], %s::text[], %s::text[])
+        """
+        Database.execute_query(query, tuple(list(column) for column in zip(*notifications)), conn=conn)
     
     @staticmethod
     def get_by_user(user_id, unread_only=False):
@@ -125,6 +192,28 @@ class Notification:
         
         return Database.execute_query(query, (user_id,), fetch_all=True)
     
+    @staticmethod
+    def get_since(user_id, after_id, limit=50):
+        """Get a user's notifications newer than `after_id`, oldest first"""
+        query = """
+            SELECT n.*, c.ticket_number
+            FROM notifications n
+            LEFT JOIN concerns c ON n.concern_id = c.concern_id
+            WHERE n.user_id = %s AND n.notification_id > %s
+            ORDER BY n.notification_id ASC
+            LIMIT %s
+        """
+        return Database.execute_query(query, (user_id, after_id, limit), fetch_all=True)
+    
+    @staticmethod
+    def latest_id(user_id):
+        """Get the id of a user's newest notification (0 if none)"""
+        query = """
+            SELECT COALESCE(MAX(notification_id), 0) AS latest_id
+            FROM notifications WHERE user_id = %s
+        """
+        return Database.execute_query(query, (user_id,), fetch_one=True)['latest_id']
+    
     @staticmethod
     def mark_as_read(notification_id):
         """Mark notification as read"""
@@ -1,13 +1,19 @@
+from backend.config.config import Config
 from backend.config.database import Database
+from backend.utils.cache import VersionedCache
 import datetime
 
+# Dashboard counters; dropped by every write that can change them
+statistics_cache = VersionedCache('concern_statistics', Config.STATS_CACHE_MAX_AGE,
+                                  shared=Config.CACHE_SHARED)
+
 class Concern:
     """Concern model for database operations"""
     
     @staticmethod
     def create(student_id, category_id, title, description, assigned_office_id=None,
-               location=None, incident_date=None, is_anonymous=False, priority='normal'):
-        """Create a new concern"""
+               location=None, incident_date=None, is_anonymous=False, priority='normal', conn=None):
+        """Create a new concern and its initial history entry in one transaction"""
         query = """
             INSERT INTO concerns (student_id, category_id, title, description, 
                                 assigned_office_id, location, incident_date, 
@@ -17,25 +23,55 @@ class Concern:
         """
         params = (student_id, category_id, title, description, assigned_office_id,
                  location, incident_date, is_anonymous, priority)
-        result = Database.execute_query(query, params, fetch_one=True)
-        
-        # Log initial status
-        if result:
-            Concern.add_status_history(
-                result['concern_id'], 
-                None, 
-                'pending', 
-                student_id, 
-                'Concern created'
-            )
+        with Database.transaction(conn) as conn:
+            result = Database.execute_query(query, params, fetch_one=True, conn=conn)
+            
+            # Log initial status
+            if result:
+                Concern.add_status_history(
+                    result['concern_id'], 
+                    None, 
+                    'pending', 
+                    student_id, 
+                    'Concern created',
+                    conn=conn
+                )
+                statistics_cache.invalidate(conn=conn)
         
         return result
     
     @staticmethod
-    def find_by_id(concern_id):
-        """Get concern by ID with related information"""
-        query = """
-            SELECT c.*, 
+    def find_by_id(concern_id, conn=None, include_history=False, include_comments=False,
+                   include_internal=False):
+        """Get concern by ID with related information
+        
+        `include_history` / `include_comments` embed the same rows as
+        get_status_history / get_comments, aggregated in the same query.
+        """
+        embedded = ""
+        if include_history:
+            embedded += """,
+                   (SELECT COALESCE(json_agg(row_to_json(h) ORDER BY h.created_at ASC), '[]')
+                    FROM (SELECT h.*, hu.first_name || ' ' || hu.last_name AS changed_by_name
+                          FROM concern_status_history h
+                          JOIN users hu ON h.changed_by = hu.user_id
+                          WHERE h.concern_id = c.concern_id) h) AS history"""
+        if include_comments:
+            embedded += """,
+                   (SELECT COALESCE(json_agg(row_to_json(cm) ORDER BY cm.created_at ASC), '[]')
+                    FROM (SELECT cm.*, cu.first_name || ' ' || cu.last_name AS author_name,
+                                 cu.role AS author_role
+                          FROM comments cm
+                          JOIN users cu ON cm.user_id = cu.user_id
+                          WHERE cm.concern_id = c.concern_id
+                            AND (%s OR cm.is_internal = false)) cm) AS comments"""
+        
+        # Every column except search_vector, which clients never need
+        query = f"""
+            SELECT c.concern_id, c.ticket_number, c.student_id, c.category_id,
+                   c.assigned_office_id, c.assigned_admin_id, c.title, c.description,
+                   c.location, c.incident_date, c.status, c.priority, c.is_anonymous,
+                   c.resolution_notes, c.resolved_at, c.resolved_by, c.created_at, c.updated_at,
                    u.first_name || ' ' || u.last_name AS student_name,
                    u.sr_code,
                    u.email AS student_email,
@@ -43,7 +79,7 @@ class Concern:
                    cat.description AS category_description,
                    o.office_name,
                    o.contact_email AS office_email,
-                   admin.first_name || ' ' || admin.last_name AS admin_name
+                   admin.first_name || ' ' || admin.last_name AS admin_name{embedded}
             FROM concerns c
             JOIN users u ON c.student_id = u.user_id
             JOIN concern_categories cat ON c.category_id = cat.category_id
@@ -51,29 +87,79 @@ class Concern:
             LEFT JOIN users admin ON c.assigned_admin_id = admin.user_id
             WHERE c.concern_id = %s
         """
-        return Database.execute_query(query, (concern_id,), fetch_one=True)
+        params = (include_internal, concern_id) if include_comments else (concern_id,)
+        concern = Database.execute_query(query, params, fetch_one=True, conn=conn)
+        
+        if concern:
+            # json_agg returns timestamps as ISO strings; restore datetimes so the
+            # embedded rows serialize exactly like the /history and /comments ones
+            for key in ('history', 'comments'):
+                for row in concern.get(key) or []:
+                    for field in ('created_at', 'updated_at'):
+                        if row.get(field):
+                            row[field] = datetime.datetime.fromisoformat(row[field])
+        
+        return concern
     
     @staticmethod
-    def get_by_student(student_id):
-        """Get all concerns by student"""
-        query = """
+    def get_by_student(student_id, limit=None, after=None, q=None, updated_since=None):
+        """Get concerns by student, newest first (best match first with `q`)
+        
+        With `limit`, returns one page; `after` is the sort key of the last
+        row of the previous page: (created_at, concern_id), or
+        (rank, created_at, concern_id) when searching. `updated_since`
+        keeps only concerns changed after that time.
+        """
+        rank, rank_params = Concern._search_rank(q)
+        query = f"""
             SELECT c.concern_id, c.ticket_number, c.title, c.description, c.status, c.priority,
                    c.created_at, c.updated_at, c.is_anonymous, c.location, c.incident_date,
                    c.category_id, c.assigned_office_id,
                    cat.category_name,
-                   o.office_name
+                   o.office_name{rank}
             FROM concerns c
             JOIN concern_categories cat ON c.category_id = cat.category_id
             LEFT JOIN offices o ON c.assigned_office_id = o.office_id
             WHERE c.student_id = %s
-            ORDER BY c.created_at DESC
         """
-        return Database.execute_query(query, (student_id,), fetch_all=True)
+        filters, params = Concern._filters(q=q, updated_since=updated_since)
+        query, params = Concern._paginate(query + filters, rank_params + [student_id] + params,
+                                          limit, after, q)
+        return Database.execute_query(query, tuple(params), fetch_all=True)
     
     @staticmethod
-    def get_all(status=None, category_id=None, priority=None):
-        """Get all concerns with optional filters"""
-        query = """
+    def count_by_student(student_id, q=None):
+        """Count concerns filed by a student"""
+        filters, params = Concern._filters(q=q)
+        query = "SELECT COUNT(*) AS total FROM concerns c WHERE c.student_id = %s" + filters
+        return Database.execute_query(query, tuple([student_id] + params), fetch_one=True)['total']
+    
+    @staticmethod
+    def get_all(status=None, category_id=None, priority=None, limit=None, after=None, q=None,
+                updated_since=None):
+        """Get all concerns with optional filters, newest first (best match first with `q`)
+        
+        With `limit`, returns one page; `after` is the sort key of the last
+        row of the previous page: (created_at, concern_id), or
+        (rank, created_at, concern_id) when searching. `updated_since`
+        keeps only concerns changed after that time.
+        """
+        query, params = Concern._all_query(status, category_id, priority, limit, after, q,
+                                           updated_since)
+        return Database.execute_query(query, tuple(params) if params else (), fetch_all=True)
+    
+    @staticmethod
+    def stream_all(status=None, category_id=None, priority=None, q=None):
+        """Yield every matching concern in get_all's order and shape, in batches of rows"""
+        query, params = Concern._all_query(status, category_id, priority, q=q)
+        return Database.stream_query(query, tuple(params) if params else ())
+    
+    @staticmethod
+    def _all_query(status=None, category_id=None, priority=None, limit=None, after=None, q=None,
+                   updated_since=None):
+        """Build get_all's query and parameters"""
+        rank, rank_params = Concern._search_rank(q)
+        query = f"""
             SELECT c.concern_id, c.ticket_number, c.title, c.description, c.status, c.priority,
                    c.created_at, c.updated_at, c.is_anonymous, c.location, c.incident_date,
                    c.category_id, c.assigned_office_id, c.student_id,
@@ -81,13 +167,83 @@ class Concern:
                         ELSE u.first_name || ' ' || u.last_name END AS student_name,
                    u.sr_code,
                    cat.category_name,
-                   o.office_name
+                   o.office_name{rank}
             FROM concerns c
             JOIN users u ON c.student_id = u.user_id
             JOIN concern_categories cat ON c.category_id = cat.category_id
             LEFT JOIN offices o ON c.assigned_office_id = o.office_id
             WHERE 1=1
         """
+        filters, params = Concern._filters(status, category_id, priority, q, updated_since)
+        return Concern._paginate(query + filters, rank_params + params, limit, after, q)
+    
+    @staticmethod
+    def count_all(status=None, category_id=None, priority=None, q=None):
+        """Count concerns matching the get_all filters"""
+        filters, params = Concern._filters(status, category_id, priority, q)
+        query = "SELECT COUNT(*) AS total FROM concerns c WHERE 1=1" + filters
+        return Database.execute_query(query, tuple(params) if params else (), fetch_one=True)['total']
+    
+    @staticmethod
+    def get_deleted_since(since, student_id=None):
+        """Ids of concerns deleted after `since` (from the concern_tombstones trigger)"""
+        query = "SELECT concern_id FROM concern_tombstones WHERE deleted_at > %s"
+        params = [since]
+        if student_id:
+            query += " AND student_id = %s"
+            params.append(student_id)
+        query += " ORDER BY concern_id"
+        return [row['concern_id'] for row in Database.execute_query(query, tuple(params), fetch_all=True)]
+    
+    @staticmethod
+    def current_timestamp():
+        """Database clock, in the same (naive) form as updated_at"""
+        return Database.execute_query("SELECT LOCALTIMESTAMP AS now", fetch_one=True)['now']
+    
+    @staticmethod
+    def get_list_version(student_id=None, status=None, category_id=None, priority=None, q=None):
+        """State of a concern list, used as its HTTP validator
+        
+        Row count and newest updated_at of the list, newest tombstone in the
+        same scope, the names version that triggers bump on renames of
+        students, categories and offices (db/add_concern_list_version.sql),
+        and the database clock. Nothing here is written by concern writers,
+        so they never wait on each other for it.
+        """
+        filters, params = Concern._filters(status, category_id, priority, q)
+        tombstones = "SELECT MAX(deleted_at) FROM concern_tombstones"
+        scope = ""
+        if student_id:
+            # Deleted rows keep only their student, so tombstones are scoped by that alone
+            tombstones += " WHERE student_id = %s"
+            scope = " AND c.student_id = %s"
+            params = [student_id] + params + [student_id]
+        query = f"""
+            SELECT COUNT(*) AS total, MAX(c.updated_at) AS last_updated,
+                   ({tombstones}) AS last_deleted,
+                   (SELECT version FROM cache_versions WHERE name = 'concern_names') AS names_version,
+                   LOCALTIMESTAMP AS now
+            FROM concerns c
+            WHERE 1=1{filters}{scope}
+        """
+        return Database.execute_query(query, tuple(params), fetch_one=True)
+    
+    # Relevance of a concern to a search; an exact ticket number always ranks first
+    # (ts_rank normalization 32 keeps text matches below 1)
+    SEARCH_RANK = """CASE WHEN c.ticket_number = UPPER(%s) THEN 1
+                         ELSE ts_rank(c.search_vector, websearch_to_tsquery('english', %s), 32) END"""
+    
+    @staticmethod
+    def _search_rank(q):
+        """Select-list column and params for the search rank (empty without `q`)"""
+        if not q:
+            return "", []
+        return f",\n                   {Concern.SEARCH_RANK} AS rank", [q, q]
+    
+    @staticmethod
+    def _filters(status=None, category_id=None, priority=None, q=None, updated_since=None):
+        """Build the WHERE clause shared by get_all and count_all"""
+        query = ""
         params = []
         
         if status:
@@ -102,42 +258,79 @@ class Concern:
             query += " AND c.priority = %s"
             params.append(priority)
         
-        query += " ORDER BY c.created_at DESC"
+        if q:
+            # Either side is an index lookup: GIN on search_vector, btree on ticket_number
+            query += (" AND (c.search_vector @@ websearch_to_tsquery('english', %s)"
+                      " OR c.ticket_number = UPPER(%s))")
+            params.extend([q, q])
         
-        return Database.execute_query(query, tuple(params) if params else (), fetch_all=True)
+        if updated_since:
+            query += " AND c.updated_at > %s"
+            params.append(updated_since)
+        
+        return query, params
     
     @staticmethod
-    def update_status(concern_id, new_status, admin_id, remarks=None):
-        """Update concern status"""
-        # Get current status
-        current = Database.execute_query(
-            "SELECT status FROM concerns WHERE concern_id = %s",
-            (concern_id,),
-            fetch_one=True
-        )
+    def _paginate(query, params, limit=None, after=None, q=None):
+        """Apply newest-first (or best-match-first) ordering and an optional keyset page"""
+        if q:
+            if after:
+                query += f" AND ({Concern.SEARCH_RANK}, c.created_at, c.concern_id) < (%s::real, %s, %s)"
+                params = params + [q, q] + list(after)
+            
+            query += " ORDER BY rank DESC, c.created_at DESC, c.concern_id DESC"
+        else:
+            if after:
+                query += " AND (c.created_at, c.concern_id) < (%s, %s)"
+                params = params + list(after)
+            
+            query += " ORDER BY c.created_at DESC, c.concern_id DESC"
         
-        if not current:
-            return None
+        if limit:
+            query += " LIMIT %s"
+            params = params + [limit]
         
-        old_status = current['status']
+        return query, params
+    
+    @staticmethod
+    def update_status(concern_id, new_status, admin_id, remarks=None, conn=None):
+        """Update concern status and log it in one statement
         
-        # Update status
+        Returns the concern with its old status and the student's email and
+        name, or None if it does not exist.
+        """
         query = """
-            UPDATE concerns 
-            SET status = %s, updated_at = CURRENT_TIMESTAMP
-            WHERE concern_id = %s
-            RETURNING concern_id, ticket_number, status
+            WITH old AS (
+                SELECT concern_id, status FROM concerns
+                WHERE concern_id = %s
+                FOR UPDATE
+            ), updated AS (
+                UPDATE concerns c
+                SET status = %s, updated_at = CURRENT_TIMESTAMP
+                FROM old
+                WHERE c.concern_id = old.concern_id
+                RETURNING c.concern_id, c.ticket_number, c.title, c.student_id,
+                          old.status AS old_status, c.status
+            ), history AS (
+                INSERT INTO concern_status_history (concern_id, old_status, new_status, changed_by, remarks)
+                SELECT concern_id, old_status, status, %s, %s FROM updated
+            )
+            SELECT updated.*, u.email AS student_email,
+                   u.first_name || ' ' || u.last_name AS student_name
+            FROM updated
+            JOIN users u ON updated.student_id = u.user_id
         """
-        result = Database.execute_query(query, (new_status, concern_id), fetch_one=True)
-        
-        # Log status change
-        if result:
-            Concern.add_status_history(concern_id, old_status, new_status, admin_id, remarks)
+        params = (concern_id, new_status, admin_id, remarks)
+        with Database.transaction(conn) as conn:
+            result = Database.execute_query(query, params, fetch_one=True, conn=conn)
+            
+            if result:
+                statistics_cache.invalidate(conn=conn)
         
         return result
     
     @staticmethod
-    def assign_to_office(concern_id, office_id, admin_id):
+    def assign_to_office(concern_id, office_id, admin_id, conn=None):
         """Assign concern to an office"""
         query = """
             UPDATE concerns 
@@ -146,10 +339,11 @@ class Concern:
             WHERE concern_id = %s
             RETURNING concern_id, ticket_number
         """
-        return Database.execute_query(query, (office_id, admin_id, concern_id), fetch_one=True)
+        return Database.execute_query(query, (office_id, admin_id, concern_id), fetch_one=True,
+                                     conn=conn)
     
     @staticmethod
-    def update_priority(concern_id, priority):
+    def update_priority(concern_id, priority, conn=None):
         """Update concern priority"""
         query = """
             UPDATE concerns 
@@ -157,35 +351,154 @@ class Concern:
             WHERE concern_id = %s
             RETURNING concern_id, ticket_number, priority
         """
-        return Database.execute_query(query, (priority, concern_id), fetch_one=True)
+        with Database.transaction(conn) as conn:
+            result = Database.execute_query(query, (priority, concern_id), fetch_one=True, conn=conn)
+            
+            if result:
+                statistics_cache.invalidate(conn=conn)
+        
+        return result
     
     @staticmethod
-    def resolve(concern_id, admin_id, resolution_notes):
-        """Mark concern as resolved"""
+    def resolve(concern_id, admin_id, resolution_notes, conn=None):
+        """Mark concern as resolved and log it in one statement
+        
+        Returns the concern with its old status and the student's email and
+        name, or None if it does not exist.
+        """
         query = """
-            UPDATE concerns 
-            SET status = 'resolved', resolved_by = %s, resolved_at = CURRENT_TIMESTAMP,
-                resolution_notes = %s, updated_at = CURRENT_TIMESTAMP
-            WHERE concern_id = %s
-            RETURNING concern_id, ticket_number, status
+            WITH old AS (
+                SELECT concern_id, status FROM concerns
+                WHERE concern_id = %s
+                FOR UPDATE
+            ), updated AS (
+                UPDATE concerns c
+                SET status = 'resolved', resolved_by = %s, resolved_at = CURRENT_TIMESTAMP,
+                    resolution_notes = %s, updated_at = CURRENT_TIMESTAMP
+                FROM old
+                WHERE c.concern_id = old.concern_id
+                RETURNING c.concern_id, c.ticket_number, c.title, c.student_id,
+                          old.status AS old_status, c.status
+            ), history AS (
+                INSERT INTO concern_status_history (concern_id, old_status, new_status, changed_by, remarks)
+                SELECT concern_id, old_status, status, %s, 'Concern resolved: ' || %s FROM updated
+            )
+            SELECT updated.*, u.email AS student_email,
+                   u.first_name || ' ' || u.last_name AS student_name
+            FROM updated
+            JOIN users u ON updated.student_id = u.user_id
+        """
+        params = (concern_id, admin_id, resolution_notes, admin_id, resolution_notes)
+        with Database.transaction(conn) as conn:
+            result = Database.execute_query(query, params, fetch_one=True, conn=conn)
+            
+            if result:
+                statistics_cache.invalidate(conn=conn)
+        
+        return result
+    
+    @staticmethod
+    def lock_many(concern_ids, conn):
+        """Lock concerns in id order (so concurrent bulk actions cannot deadlock)"""
+        query = """
+            SELECT concern_id FROM concerns
+            WHERE concern_id = ANY(%s)
+            ORDER BY concern_id
+            FOR UPDATE
         """
-        result = Database.execute_query(query, (admin_id, resolution_notes, concern_id), fetch_one=True)
+        return Database.execute_query(query, (list(concern_ids),), fetch_all=True, conn=conn)
+    
+    @staticmethod
+    def bulk_update_status(concern_ids, new_status, admin_id, remarks=None, conn=None):
+        """Set the status of many concerns and log their history in one statement
         
-        if result:
-            Concern.add_status_history(concern_id, 'in-progress', 'resolved', admin_id, 
-                                      'Concern resolved: ' + resolution_notes)
+        Concerns already in `new_status` are left alone. Returns the changed
+        concerns with their old status and the student's email and name.
+        """
+        query = """
+            WITH updated AS (
+                UPDATE concerns c
+                SET status = %s, updated_at = CURRENT_TIMESTAMP
+                FROM concerns old
+                WHERE old.concern_id = c.concern_id
+                  AND c.concern_id = ANY(%s)
+                  AND c.status <> %s
+                RETURNING c.concern_id, c.ticket_number, c.title, c.student_id,
+                          old.status AS old_status, c.status
+            ), history AS (
+                INSERT INTO concern_status_history (concern_id, old_status, new_status, changed_by, remarks)
+                SELECT concern_id, old_status, status, %s, %s FROM updated
+            )
+            SELECT updated.*, u.email AS student_email,
+                   u.first_name || ' ' || u.last_name AS student_name
+            FROM updated
+            JOIN users u ON updated.student_id = u.user_id
+            ORDER BY updated.concern_id
+        """
+        params = (new_status, list(concern_ids), new_status, admin_id, remarks)
+        with Database.transaction(conn) as conn:
+            Concern.lock_many(concern_ids, conn)
+            result = Database.execute_query(query, params, fetch_all=True, conn=conn)
+            
+            if result:
+                statistics_cache.invalidate(conn=conn)
         
         return result
     
     @staticmethod
-    def add_status_history(concern_id, old_status, new_status, changed_by, remarks=None):
+    def bulk_assign_to_office(concern_ids, office_id, admin_id, conn=None):
+        """Assign many concerns to an office in one statement
+        
+        Returns the assigned concerns with the student's email and name.
+        """
+        query = """
+            WITH updated AS (
+                UPDATE concerns
+                SET assigned_office_id = %s, assigned_admin_id = %s,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE concern_id = ANY(%s)
+                RETURNING concern_id, ticket_number, title, student_id
+            )
+            SELECT updated.*, u.email AS student_email,
+                   u.first_name || ' ' || u.last_name AS student_name
+            FROM updated
+            JOIN users u ON updated.student_id = u.user_id
+            ORDER BY updated.concern_id
+        """
+        with Database.transaction(conn) as conn:
+            Concern.lock_many(concern_ids, conn)
+            return Database.execute_query(query, (office_id, admin_id, list(concern_ids)),
+                                         fetch_all=True, conn=conn)
+    
+    @staticmethod
+    def bulk_update_priority(concern_ids, priority, conn=None):
+        """Set the priority of many concerns in one statement"""
+        query = """
+            UPDATE concerns 
+            SET priority = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE concern_id = ANY(%s)
+            RETURNING concern_id, ticket_number, priority
+        """
+        with Database.transaction(conn) as conn:
+            Concern.lock_many(concern_ids, conn)
+            result = Database.execute_query(query, (priority, list(concern_ids)), fetch_all=True,
+                                            conn=conn)
+            
+            if result:
+                statistics_cache.invalidate(conn=conn)
+        
+        return sorted(result, key=lambda row: row['concern_id'])
+    
+    @staticmethod
+    def add_status_history(concern_id, old_status, new_status, changed_by, remarks=None, conn=None):
         """Add entry to status history"""
         query = """
             INSERT INTO concern_status_history 
             (concern_id, old_status, new_status, changed_by, remarks)
             VALUES (%s, %s, %s, %s, %s)
         """
-        Database.execute_query(query, (concern_id, old_status, new_status, changed_by, remarks))
+        Database.execute_query(query, (concern_id, old_status, new_status, changed_by, remarks),
+                               conn=conn)
     
     @staticmethod
     def get_status_history(concern_id):
@@ -200,7 +513,7 @@ class Concern:
         return Database.execute_query(query, (concern_id,), fetch_all=True)
     
     @staticmethod
-    def add_comment(concern_id, user_id, comment_text, is_internal=False):
+    def add_comment(concern_id, user_id, comment_text, is_internal=False, conn=None):
         """Add comment to concern"""
         query = """
             INSERT INTO comments (concern_id, user_id, comment_text, is_internal)
@@ -208,7 +521,7 @@ class Concern:
             RETURNING comment_id, comment_text, created_at
         """
         return Database.execute_query(query, (concern_id, user_id, comment_text, is_internal), 
-                                     fetch_one=True)
+                                     fetch_one=True, conn=conn)
     
     @staticmethod
     def get_comments(concern_id, include_internal=False):
@@ -229,7 +542,12 @@ class Concern:
     
     @staticmethod
     def get_statistics():
-        """Get concern statistics"""
+        """Get concern statistics (cached, see statistics_cache)"""
+        return statistics_cache.get(Concern._load_statistics)
+    
+    @staticmethod
+    def _load_statistics():
+        """Count concerns by status and priority"""
         query = """
             SELECT 
                 COUNT(*) as total,
@@ -243,3 +561,43 @@ class Concern:
             FROM concerns
         """
         return Database.execute_query(query, fetch_one=True)
+    
+    @staticmethod
+    def get_report(start_date=None, end_date=None):
+        """Aggregate concerns created between two dates (inclusive) for the reports page"""
+        query = """
+            WITH scope AS (
+                SELECT c.student_id, c.status, c.priority, c.created_at,
+                       COALESCE(c.resolved_at, c.updated_at) AS resolved_at,
+                       cat.category_name,
+                       COALESCE(o.office_name, 'Unassigned') AS office_name
+                FROM concerns c
+                JOIN concern_categories cat ON c.category_id = cat.category_id
+                LEFT JOIN offices o ON c.assigned_office_id = o.office_id
+                WHERE (%(start_date)s::date IS NULL OR c.created_at >= %(start_date)s::date)
+                  AND (%(end_date)s::date IS NULL OR c.created_at < %(end_date)s::date + 1)
+            )
+            SELECT
+                (SELECT COUNT(*) FROM scope) AS total,
+                (SELECT COUNT(*) FROM scope WHERE status = 'resolved') AS resolved,
+                (SELECT COUNT(DISTINCT student_id) FROM scope) AS active_users,
+                (SELECT ROUND((AVG(EXTRACT(EPOCH FROM resolved_at - created_at)) / 86400)::numeric, 1)::float8
+                 FROM scope WHERE status = 'resolved') AS avg_resolution_days,
+                (SELECT COALESCE(json_agg(t ORDER BY t.count DESC), '[]')
+                 FROM (SELECT status, COUNT(*) AS count FROM scope GROUP BY status) t) AS by_status,
+                (SELECT COALESCE(json_agg(t ORDER BY t.count DESC), '[]')
+                 FROM (SELECT category_name, COUNT(*) AS count FROM scope GROUP BY category_name) t) AS by_category,
+                (SELECT COALESCE(json_agg(t ORDER BY t.count DESC), '[]')
+                 FROM (SELECT office_name, COUNT(*) AS count FROM scope GROUP BY office_name) t) AS by_office,
+                (SELECT COALESCE(json_agg(t ORDER BY t.count DESC), '[]')
+                 FROM (SELECT priority, COUNT(*) AS count FROM scope GROUP BY priority) t) AS by_priority,
+                (SELECT COALESCE(json_agg(t ORDER BY t.month), '[]')
+                 FROM (SELECT TO_CHAR(created_at, 'YYYY-MM') AS month, COUNT(*) AS count
+                       FROM scope GROUP BY 1) t) AS by_month
+        """
+        params = {'start_date': start_date, 'end_date': end_date}
+        report = Database.execute_query(query, params, fetch_one=True)
+        
+        total = report['total']
+        report['resolution_rate'] = round(report['resolved'] * 100 / total, 1) if total else 0
+        return report
@@ -0,0 +1,104 @@
+from backend.config.database import Database
+
+class EmailOutbox:
+    """Email outbox model: messages queued by requests and delivered by the email worker"""
+    
+    @staticmethod
+    def enqueue(recipient, subject, body_text, body_html=None, conn=None):
+        """Queue an email (pass the request's conn to commit it with the change it reports)"""
+        query = """
+            INSERT INTO email_outbox (recipient, subject, body_text, body_html)
+            VALUES (%s, %s, %s, %s)
+            RETURNING email_id
+        """
+        return Database.execute_query(query, (recipient, subject, body_text, body_html),
+                                     fetch_one=True, conn=conn)
+    
+    @staticmethod
+    def enqueue_many(messages, conn=None):
+        """Queue many (recipient, subject, body_text, body_html) emails in one insert"""
+        query = """
+            INSERT INTO email_outbox (recipient, subject, body_text, body_html)
+            SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+        """
+        Database.execute_query(query, tuple(list(column) for column in zip(*messages)), conn=conn)
+    
+    @staticmethod
+    def claim_batch(limit, lease_seconds, max_attempts):
+        """Lease up to `limit` due emails so no other worker picks them up meanwhile
+        
+        A worker that dies mid-batch loses its lease after `lease_seconds`
+        and the emails become due again, until `max_attempts` claims are used
+        up (see fail_exhausted).
+        """
+        query = """
+            WITH claimed AS (
+                UPDATE email_outbox
+                SET next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                    attempts = attempts + 1
+                WHERE email_id IN (
+                    SELECT email_id FROM email_outbox
+                    WHERE status = 'pending' AND next_attempt_at <= CURRENT_TIMESTAMP
+                      AND attempts < %s
+                    ORDER BY next_attempt_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING email_id, recipient, subject, body_text, body_html, attempts
+            )
+            SELECT * FROM claimed ORDER BY email_id
+        """
+        return Database.execute_query(query, (lease_seconds, max_attempts, limit), fetch_all=True)
+    
+    @staticmethod
+    def fail_exhausted(max_attempts):
+        """Give up on emails whose last allowed attempt never reported back
+        
+        An email whose send crashes or hangs the worker is never marked
+        failed by it; once its final lease expires it is failed here instead
+        of being claimed again. Returns the number of emails failed.
+        """
+        query = """
+            UPDATE email_outbox
+            SET status = 'failed',
+                last_error = COALESCE(last_error, 'Worker did not finish the last attempt')
+            WHERE status = 'pending' AND attempts >= %s AND next_attempt_at <= CURRENT_TIMESTAMP
+            RETURNING email_id
+        """
+        return len(Database.execute_query(query, (max_attempts,), fetch_all=True))
+    
+    @staticmethod
+    def mark_sent(email_id, attempts):
+        """Mark an email as delivered
+        
+        `attempts` is the value from the claim. Returns False when the lease
+        expired and the email was claimed again (or already finished).
+        """
+        query = """
+            UPDATE email_outbox
+            SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = NULL
+            WHERE email_id = %s AND attempts = %s AND status = 'pending'
+            RETURNING email_id
+        """
+        return Database.execute_query(query, (email_id, attempts), fetch_one=True) is not None
+    
+    @staticmethod
+    def mark_failed(email_id, attempts, error, retry_in_seconds=None):
+        """Record a failed attempt; retry after `retry_in_seconds` or give up when None
+        
+        Like mark_sent, this is a no-op if the email has been claimed again since.
+        """
+        if retry_in_seconds is None:
+            query = """
+                UPDATE email_outbox
+                SET status = 'failed', last_error = %s
+                WHERE email_id = %s AND attempts = %s AND status = 'pending'
+            """
+            Database.execute_query(query, (error, email_id, attempts))
+        else:
+            query = """
+                UPDATE email_outbox
+                SET next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => %s), last_error = %s
+                WHERE email_id = %s AND attempts = %s AND status = 'pending'
+            """
+            Database.execute_query(query, (retry_in_seconds, error, email_id, attempts))
@@ -0,0 +1,97 @@
+from backend.config.database import Database
+import json
+
+class Job:
+    """Background job model: deferred work queued by requests and run by the job worker"""
+    
+    @staticmethod
+    def enqueue(job_type, payload, max_attempts, delay_seconds=0, conn=None):
+        """Queue a job (pass the request's conn so it only runs if the change commits)"""
+        query = """
+            INSERT INTO jobs (job_type, payload, max_attempts, run_at)
+            VALUES (%s, %s::jsonb, %s, CURRENT_TIMESTAMP + make_interval(secs => %s))
+            RETURNING job_id
+        """
+        return Database.execute_query(query, (job_type, json.dumps(payload), max_attempts, delay_seconds),
+                                     fetch_one=True, conn=conn)
+    
+    @staticmethod
+    def claim_batch(limit, lease_seconds):
+        """Lease up to `limit` due jobs so no other worker picks them up meanwhile
+        
+        The lease is the job's visibility timeout: if the worker dies (or the
+        job is still running) after `lease_seconds`, the job becomes due again,
+        until its `max_attempts` claims are used up (see fail_exhausted).
+        """
+        query = """
+            WITH claimed AS (
+                UPDATE jobs
+                SET run_at = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                    attempts = attempts + 1
+                WHERE job_id IN (
+                    SELECT job_id FROM jobs
+                    WHERE status = 'pending' AND run_at <= CURRENT_TIMESTAMP
+                      AND attempts < max_attempts
+                    ORDER BY run_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING job_id, job_type, payload, attempts, max_attempts
+            )
+            SELECT * FROM claimed ORDER BY job_id
+        """
+        return Database.execute_query(query, (lease_seconds, limit), fetch_all=True)
+    
+    @staticmethod
+    def fail_exhausted():
+        """Give up on jobs whose last allowed attempt never reported back
+        
+        A job that kills the worker or always outlives its lease never
+        reaches the worker's give-up branch; once its final lease expires it
+        is failed here instead of being claimed again. Returns the failed jobs.
+        """
+        query = """
+            UPDATE jobs
+            SET status = 'failed', finished_at = CURRENT_TIMESTAMP,
+                last_error = COALESCE(last_error, 'Worker did not finish the last attempt')
+            WHERE status = 'pending' AND attempts >= max_attempts AND run_at <= CURRENT_TIMESTAMP
+            RETURNING job_id, job_type
+        """
+        return Database.execute_query(query, fetch_all=True)
+    
+    @staticmethod
+    def mark_done(job_id, attempts, conn=None):
+        """Mark a job as finished (pass the handler's conn to commit with its work)
+        
+        `attempts` is the value from the claim. Returns False when the lease
+        has expired and the job was claimed again (or already finished), in
+        which case the caller must roll back the handler's work.
+        """
+        query = """
+            UPDATE jobs
+            SET status = 'done', finished_at = CURRENT_TIMESTAMP, last_error = NULL
+            WHERE job_id = %s AND attempts = %s AND status = 'pending'
+            RETURNING job_id
+        """
+        return Database.execute_query(query, (job_id, attempts), fetch_one=True, conn=conn) is not None
+    
+    @staticmethod
+    def mark_failed(job_id, attempts, error, retry_in_seconds=None):
+        """Record a failed attempt; retry after `retry_in_seconds` or give up when None
+        
+        Like mark_done, this is a no-op if the job has been claimed again since.
+        """
+        if retry_in_seconds is None:
+            query = """
+                UPDATE jobs
+                SET status = 'failed', finished_at = CURRENT_TIMESTAMP, last_error = %s
+                WHERE job_id = %s AND attempts = %s AND status = 'pending'
+            """
+            Database.execute_query(query, (error, job_id, attempts))
+        else:
+            query = """
+                UPDATE jobs
+                SET run_at = CURRENT_TIMESTAMP + make_interval(secs => %s), last_error = %s
+                WHERE job_id = %s AND attempts = %s AND status = 'pending'
+            """
+            Database.execute_query(query, (retry_in_seconds, error, job_id, attempts))
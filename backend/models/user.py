@@ -36,18 +36,25 @@ class User:
         return Database.execute_query(query, (sr_code,), fetch_one=True)
     
     @staticmethod
-    def find_by_id(user_id):
+    def find_by_id(user_id, conn=None):
         """Find user by ID"""
         query = """
             SELECT user_id, sr_code, email, first_name, last_name, middle_name,
                    program, year_level, role, is_active, created_at
             FROM users WHERE user_id = %s
         """
-        return Database.execute_query(query, (user_id,), fetch_one=True)
+        return Database.execute_query(query, (user_id,), fetch_one=True, conn=conn)
     
     @staticmethod
-    def get_all_students():
-        """Get all student users"""
+    def get_updated_at(user_id):
+        """Last change to a user's row, used as the profile's HTTP validator"""
+        query = "SELECT updated_at FROM users WHERE user_id = %s"
+        result = Database.execute_query(query, (user_id,), fetch_one=True)
+        return result['updated_at'] if result else None
+    
+    @staticmethod
+    def stream_all_students():
+        """Yield all student users in batches of rows"""
         query = """
             SELECT user_id, sr_code, email, first_name, last_name, middle_name,
                    program, year_level, created_at
@@ -55,7 +62,7 @@ class User:
             WHERE role = 'student' AND is_active = true
             ORDER BY last_name, first_name
         """
-        return Database.execute_query(query, fetch_all=True)
+        return Database.stream_query(query)
     
     @staticmethod
     def get_all_admins():
@@ -68,6 +75,97 @@ class User:
         """
         return Database.execute_query(query, fetch_all=True)
     
+    # Directory orderings: (ORDER BY, keyset comparison); every key ends in user_id
+    DIRECTORY_SORTS = {
+        'name': ("u.last_name, u.first_name, u.user_id",
+                 "(u.last_name, u.first_name, u.user_id) > (%s, %s, %s)"),
+        'created_at': ("u.created_at DESC, u.user_id DESC",
+                       "(u.created_at, u.user_id) < (%s, %s)"),
+        # Computed, not stored: every page counts the concerns of every matching user
+        'concern_count': ("concern_count DESC, u.user_id DESC",
+                          "(cc.concern_count, u.user_id) < (%s, %s)")
+    }
+    
+    @staticmethod
+    def get_directory(role=None, program=None, year_level=None, sort=None, limit=None, after=None):
+        """Get active users with their concern counts
+        
+        Without `sort` the legacy order (admins first, then by name) is used.
+        With `sort` (a DIRECTORY_SORTS key) and `limit`, returns one page;
+        `after` is the sort key of the last row of the previous page.
+        
+        Counts come from an index lookup per user (idx_concerns_student_id).
+        With `sort='name'` or `'created_at'` and a `limit`, only the users on
+        the page are counted. Sorting by `concern_count` must count every
+        matching user on every page before it can sort, and its keyset
+        condition cannot use an index. The unpaginated list also counts
+        every matching user.
+        """
+        query = """
+            SELECT 
+                u.user_id,
+                u.sr_code,
+                u.email,
+                u.first_name,
+                u.last_name,
+                u.middle_name,
+                u.program,
+                u.year_level,
+                u.role,
+                u.is_active,
+                u.created_at,
+                cc.concern_count
+            FROM users u
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS concern_count FROM concerns c WHERE c.student_id = u.user_id
+            ) cc
+            WHERE u.is_active = true
+        """
+        filters, params = User._directory_filters(role, program, year_level)
+        query += filters
+        
+        if sort:
+            order_by, keyset = User.DIRECTORY_SORTS[sort]
+            if after:
+                query += " AND " + keyset
+                params.extend(after)
+            query += " ORDER BY " + order_by
+        else:
+            query += " ORDER BY u.role DESC, u.last_name, u.first_name"
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        
+        return Database.execute_query(query, tuple(params) if params else (), fetch_all=True)
+    
+    @staticmethod
+    def count_directory(role=None, program=None, year_level=None):
+        """Count active users matching the get_directory filters"""
+        filters, params = User._directory_filters(role, program, year_level)
+        query = "SELECT COUNT(*) AS total FROM users u WHERE u.is_active = true" + filters
+        return Database.execute_query(query, tuple(params) if params else (), fetch_one=True)['total']
+    
+    @staticmethod
+    def _directory_filters(role=None, program=None, year_level=None):
+        """Build the WHERE clause shared by get_directory and count_directory"""
+        query = ""
+        params = []
+        
+        if role:
+            query += " AND u.role = %s"
+            params.append(role)
+        
+        if program:
+            query += " AND u.program = %s"
+            params.append(program)
+        
+        if year_level:
+            query += " AND u.year_level = %s"
+            params.append(int(year_level))
+        
+        return query, params
+    
     @staticmethod
     def update_profile(user_id, first_name, last_name, middle_name=None, 
                       program=None, year_level=None):
@@ -83,6 +181,13 @@ class User:
         params = (first_name, last_name, middle_name, program, year_level, user_id)
         return Database.execute_query(query, params, fetch_one=True)
     
+    @staticmethod
+    def update_password_hash(user_id, password_hash):
+        """Replace a user's password hash (e.g. after a bcrypt cost change)"""
+        query = "UPDATE users SET password_hash = %s WHERE user_id = %s"
+        Database.execute_query(query, (password_hash, user_id))
+        return True
+    
     @staticmethod
     def deactivate(user_id):
         """Deactivate user account"""
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify, redirect
 from backend.models.user import User
-from backend.utils.auth import hash_password, verify_password, generate_token
+from backend.utils.auth import hash_password, verify_password, needs_rehash, generate_token, PasswordHasherBusy
 from backend.utils.google_auth import verify_google_token, get_google_oauth_url, exchange_code_for_token
 from backend.utils.email_verification import (
     generate_verification_code, 
@@ -97,6 +97,8 @@ def register():
         
         return jsonify({'error': 'Registration failed'}), 500
         
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Too many sign-ins right now, please try again'}), 503, {'Retry-After': '1'}
     except Exception as e:
         print(f"Registration error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -121,6 +123,15 @@ def login():
         if not verify_password(data['password'], user['password_hash']):
             return jsonify({'error': 'Invalid credentials'}), 401
         
+        # Upgrade hashes made with an older cost while we have the password.
+        # Best effort: a busy hash pool or a failed update must not fail a
+        # correct login; the next login tries again.
+        if needs_rehash(user['password_hash']):
+            try:
+                User.update_password_hash(user['user_id'], hash_password(data['password']))
+            except Exception as e:
+                print(f"Password rehash skipped for user {user['user_id']}: {e!r}")
+        
         # Generate token
         token = generate_token(user['user_id'], user['role'])
         
@@ -139,6 +150,8 @@ def login():
             'token': token
         }), 200
         
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Too many sign-ins right now, please try again'}), 503, {'Retry-After': '1'}
     except Exception as e:
         print(f"Login error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -1,16 +1,25 @@
 from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
+from datetime import datetime, timedelta
 import os
 from backend.models.concern import Concern
 from backend.models.category import Category, Office, Notification
 from backend.models.user import User
+from backend.config.config import Config
+from backend.config.database import Database
 from backend.utils.auth import token_required, admin_required
+from backend.utils.http_cache import conditional
+from backend.utils.jobs import enqueue
+from backend.utils.metrics import UPLOAD_BYTES, UPLOAD_FILES
+from backend.utils.pagination import encode_cursor, decode_cursor, parse_page_size
+from backend.utils.streaming import stream_json_array
 from backend.utils.email_service import (
-    send_concern_created_email, 
     send_status_update_email,
     send_concern_resolved_email,
-    send_comment_notification_email,
-    send_concern_assigned_email
+    send_concern_assigned_email,
+    build_status_update_email,
+    build_concern_assigned_email,
+    queue_emails
 )
 
 concern_bp = Blueprint('concern', __name__)
@@ -20,6 +29,16 @@ UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'doc', 'docx'}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+# Keyset pagination for concern lists
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Most concerns one bulk action may touch
+MAX_BULK_SIZE = 500
+
+# Most changed concerns returned by /changes before asking the client to reload
+MAX_CHANGES = 500
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -63,6 +82,8 @@ def create_concern():
                     filename = f"{timestamp}_{filename}"
                     filepath = os.path.join(UPLOAD_FOLDER, filename)
                     file.save(filepath)
+                    UPLOAD_FILES.inc()
+                    UPLOAD_BYTES.inc(os.path.getsize(filepath))
                     attachment_paths.append(filepath)
         
         # Convert is_anonymous to boolean
@@ -70,101 +91,243 @@ def create_concern():
         if isinstance(is_anonymous, str):
             is_anonymous = is_anonymous.lower() in ['true', '1', 'yes']
         
-        # Create concern
-        concern = Concern.create(
-            student_id=request.user_id,
-            category_id=data['category_id'],
-            title=data['title'],
-            description=data['description'],
-            assigned_office_id=data.get('assigned_office_id'),
-            location=data.get('location'),
-            incident_date=data.get('incident_date'),
-            is_anonymous=is_anonymous,
-            priority=data.get('priority', 'normal')
-        )
-        
-        if concern:
-            # Get student details for email
-            student = User.find_by_id(request.user_id)
-            
-            # Create notification
-            Notification.create(
-                user_id=request.user_id,
-                concern_id=concern['concern_id'],
-                notification_type='concern_created',
-                title='Concern Received',
-                message=f'Your concern {concern["ticket_number"]} has been received and is being reviewed.'
+        # Concern, history and notification are written on one connection and committed together
+        with Database.transaction() as conn:
+            # Create concern
+            concern = Concern.create(
+                student_id=request.user_id,
+                category_id=data['category_id'],
+                title=data['title'],
+                description=data['description'],
+                assigned_office_id=data.get('assigned_office_id'),
+                location=data.get('location'),
+                incident_date=data.get('incident_date'),
+                is_anonymous=is_anonymous,
+                priority=data.get('priority', 'normal'),
+                conn=conn
             )
             
-            # Send email notification
-            if student and not is_anonymous:
-                student_name = f"{student['first_name']} {student['last_name']}"
-                send_concern_created_email(
-                    student['email'],
-                    student_name,
-                    concern['ticket_number'],
-                    concern['title']
-                )
-            
+            if concern:
+                # Notification and confirmation email are sent by the job worker after commit
+                enqueue('concern_created', conn=conn, concern_id=concern['concern_id'])
+        
+        if concern:
             return jsonify({
                 'message': 'Concern created successfully',
                 'concern': concern
             }), 201
         
         return jsonify({'error': 'Failed to create concern'}), 500
-        
+    
     except Exception as e:
         print(f"Create concern error: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({'error': 'Internal server error'}), 500
 
+def concerns_version():
+    """HTTP validator for GET /api/concerns: row count and newest change in the caller's scope
+    
+    updated_at is stamped when a transaction starts, so a write committing
+    late can carry a timestamp older than the newest one already seen. While
+    the newest change is within CONCERN_CHANGES_OVERLAP_SECONDS (as in
+    /changes) the list counts as unsettled and the ETag includes the clock,
+    so no 304 is given until every write from that window has committed.
+    """
+    q = request.args.get('q', '').strip() or None
+    if request.user_role == 'student':
+        # Students' lists ignore the admin filters
+        version = Concern.get_list_version(student_id=request.user_id, q=q)
+    else:
+        version = Concern.get_list_version(
+            status=request.args.get('status') or None,
+            category_id=request.args.get('category_id') or None,
+            priority=request.args.get('priority') or None,
+            q=q
+        )
+    
+    parts = [request.user_role, request.user_id, version['total'], version['last_updated'],
+             version['last_deleted'], version['names_version']]
+    newest = max(filter(None, [version['last_updated'], version['last_deleted']]), default=None)
+    if newest and version['now'] - newest < timedelta(seconds=Config.CONCERN_CHANGES_OVERLAP_SECONDS):
+        parts.append(version['now'])
+    return parts, None
+
 @concern_bp.route('/', methods=['GET'])
 @token_required
+@conditional(concerns_version)
 def get_concerns():
-    """Get concerns (filtered by role)"""
+    """Get concerns (filtered by role)
+    
+    Passing `limit` or `cursor` switches to keyset pagination and returns
+    {concerns, next_cursor, total}; `include_total=false` skips the count.
+    `q` is a full-text search (or exact ticket number); results are then
+    ordered by relevance.
+    """
     try:
         status = request.args.get('status') or None
         category_id = request.args.get('category_id') or None
         priority = request.args.get('priority') or None
+        q = request.args.get('q', '').strip() or None
+        
+        if 'limit' in request.args or 'cursor' in request.args:
+            return get_concerns_page(status, category_id, priority, q)
         
         # Students only see their own concerns
         if request.user_role == 'student':
-            concerns = Concern.get_by_student(request.user_id)
+            concerns = Concern.get_by_student(request.user_id, q=q)
         else:
-            # Admins see all concerns
-            concerns = Concern.get_all(status, category_id, priority)
+            # Admins see all concerns, streamed in batches so the list is never held in memory
+            return stream_json_array(Concern.stream_all(status, category_id, priority, q=q))
         
         # Ensure concerns is never None
         if concerns is None:
             concerns = []
         
         return jsonify(concerns), 200  # Return array directly for frontend
-        
+    
     except Exception as e:
         print(f"Get concerns error: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@concern_bp.route('/changes', methods=['GET'])
+@token_required
+def get_concern_changes():
+    """Concerns changed or deleted since a previous sync (for clients keeping a local copy)
+    
+    Call without `since` to get a starting cursor, load the full list, then
+    pass the latest `cursor` as `since`. Returns {changes, deleted, cursor,
+    reset}; on `reset` too much changed and the client should reload the
+    full list. `changes` may repeat rows from the previous sync, so apply
+    them as upserts.
+    """
+    try:
+        since = request.args.get('since')
+        try:
+            since = decode_cursor(since, datetime)[0] if since else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Read the clock first so nothing committed during this request is skipped next time
+        response = {
+            'changes': [],
+            'deleted': [],
+            'cursor': encode_cursor(Concern.current_timestamp()),
+            'reset': False
+        }
+        
+        if since:
+            # updated_at is stamped when a transaction starts, so a write that
+            # commits after the previous sync can carry an earlier timestamp
+            window_start = since - timedelta(seconds=Config.CONCERN_CHANGES_OVERLAP_SECONDS)
+            student_id = request.user_id if request.user_role == 'student' else None
+            
+            if student_id:
+                changes = Concern.get_by_student(student_id, limit=MAX_CHANGES + 1,
+                                                 updated_since=window_start)
+            else:
+                changes = Concern.get_all(limit=MAX_CHANGES + 1, updated_since=window_start)
+            
+            if len(changes) > MAX_CHANGES:
+                response['reset'] = True
+            else:
+                response['changes'] = changes
+                response['deleted'] = Concern.get_deleted_since(window_start, student_id)
+        
+        return jsonify(response), 200
+    
+    except Exception as e:
+        print(f"Get concern changes error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@concern_bp.route('/export', methods=['GET'])
+@admin_required
+def export_concerns():
+    """Download every concern matching the list filters as a JSON file (Admin only)
+    
+    Rows have the same fields as GET /api/concerns/ and are streamed from a
+    server-side cursor, so the export runs in constant memory.
+    """
+    try:
+        status = request.args.get('status') or None
+        category_id = request.args.get('category_id') or None
+        priority = request.args.get('priority') or None
+        q = request.args.get('q', '').strip() or None
+        
+        filename = f"concerns-{datetime.now():%Y%m%d-%H%M%S}.json"
+        return stream_json_array(
+            Concern.stream_all(status, category_id, priority, q=q),
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    
+    except Exception as e:
+        print(f"Export concerns error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def get_concerns_page(status, category_id, priority, q=None):
+    """Return one keyset page of concerns for the current user"""
+    # Search results are ordered by rank first, so the rank is part of the cursor
+    cursor_types = (float, datetime, int) if q else (datetime, int)
+    try:
+        limit = parse_page_size(request.args.get('limit'), DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor, *cursor_types) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    include_total = request.args.get('include_total', 'true').lower() != 'false'
+    
+    # Fetch one extra row to know whether another page exists
+    if request.user_role == 'student':
+        concerns = Concern.get_by_student(request.user_id, limit=limit + 1, after=after, q=q)
+    else:
+        concerns = Concern.get_all(status, category_id, priority, limit=limit + 1, after=after, q=q)
+    
+    next_cursor = None
+    if len(concerns) > limit:
+        concerns = concerns[:limit]
+        last = concerns[-1]
+        sort_key = (last['created_at'], last['concern_id'])
+        next_cursor = encode_cursor(last['rank'], *sort_key) if q else encode_cursor(*sort_key)
+    
+    response = {'concerns': concerns, 'next_cursor': next_cursor}
+    
+    if include_total:
+        if request.user_role == 'student':
+            response['total'] = Concern.count_by_student(request.user_id, q)
+        else:
+            response['total'] = Concern.count_all(status, category_id, priority, q)
+    
+    return jsonify(response), 200
+
 @concern_bp.route('/<int:concern_id>', methods=['GET'])
 @token_required
 def get_concern_detail(concern_id):
-    """Get concern details"""
+    """Get concern details
+    
+    `?include=history,comments` embeds the status history and comments so the
+    dashboards can open a concern with a single request.
+    """
     try:
-        concern = Concern.find_by_id(concern_id)
+        include = {part.strip() for part in request.args.get('include', '').split(',') if part.strip()}
+        if not include <= {'history', 'comments'}:
+            return jsonify({'error': 'include may only contain history, comments'}), 400
+        
+        concern = Concern.find_by_id(
+            concern_id,
+            include_history='history' in include,
+            include_comments='comments' in include,
+            # Include internal comments only for admins
+            include_internal=request.user_role == 'admin'
+        )
         
         if not concern:
             return jsonify({'error': 'Concern not found'}), 404
         
-        # Get status history
-        history = Concern.get_status_history(concern_id)
-        
-        # Get comments
-        comments = Concern.get_comments(concern_id, include_internal=True)
-        
         return jsonify(concern), 200  # Return concern directly
-        
+    
     except Exception as e:
         print(f"Get concern detail error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -183,53 +346,45 @@ def update_concern_status(concern_id):
         if data['status'] not in valid_statuses:
             return jsonify({'error': 'Invalid status'}), 400
         
-        # Get concern before update to check old status
-        concern = Concern.find_by_id(concern_id)
-        if not concern:
-            return jsonify({'error': 'Concern not found'}), 404
-        
-        old_status = concern['status']
-        
-        result = Concern.update_status(
-            concern_id=concern_id,
-            new_status=data['status'],
-            admin_id=request.user_id,
-            remarks=data.get('remarks')
-        )
-        
-        if result:
-            # Get student details for email
-            student = User.find_by_id(concern['student_id'])
+        with Database.transaction() as conn:
+            result = Concern.update_status(
+                concern_id=concern_id,
+                new_status=data['status'],
+                admin_id=request.user_id,
+                remarks=data.get('remarks'),
+                conn=conn
+            )
+            
+            if not result:
+                return jsonify({'error': 'Concern not found'}), 404
             
             # Create notification for student
             Notification.create(
-                user_id=concern['student_id'],
+                user_id=result['student_id'],
                 concern_id=concern_id,
                 notification_type='status_changed',
                 title='Status Updated',
-                message=f'Your concern {concern["ticket_number"]} status has been updated to {data["status"]}.'
+                message=f'Your concern {result["ticket_number"]} status has been updated to {data["status"]}.',
+                conn=conn
             )
             
-            # Send email notification
-            if student:
-                student_name = f"{student['first_name']} {student['last_name']}"
-                send_status_update_email(
-                    student['email'],
-                    student_name,
-                    concern['ticket_number'],
-                    concern['title'],
-                    old_status,
-                    data['status'],
-                    data.get('remarks')
-                )
-            
-            return jsonify({
-                'message': 'Status updated successfully',
-                'concern': result
-            }), 200
-        
-        return jsonify({'error': 'Failed to update status'}), 500
+            # Queue email notification (delivered by the email worker after commit)
+            send_status_update_email(
+                result['student_email'],
+                result['student_name'],
+                result['ticket_number'],
+                result['title'],
+                result['old_status'],
+                data['status'],
+                data.get('remarks'),
+                conn=conn
+            )
         
+        return jsonify({
+            'message': 'Status updated successfully',
+            'concern': result
+        }), 200
+    
     except Exception as e:
         print(f"Update status error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -258,7 +413,7 @@ def update_concern_priority(concern_id):
             }), 200
         
         return jsonify({'error': 'Concern not found'}), 404
-        
+    
     except Exception as e:
         print(f"Update priority error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -273,55 +428,157 @@ def assign_concern(concern_id):
         if 'office_id' not in data:
             return jsonify({'error': 'office_id is required'}), 400
         
-        # Validate office exists
-        office = Office.find_by_id(data['office_id'])
-        if not office:
-            return jsonify({'error': 'Invalid office'}), 400
-        
-        result = Concern.assign_to_office(
-            concern_id=concern_id,
-            office_id=data['office_id'],
-            admin_id=request.user_id
-        )
-        
-        if result:
-            # Get concern details
-            concern = Concern.find_by_id(concern_id)
-            
-            # Get student details for email
-            student = User.find_by_id(concern['student_id'])
+        with Database.transaction() as conn:
+            # Validate office exists
+            office = Office.find_by_id(data['office_id'], conn=conn)
+            if not office:
+                return jsonify({'error': 'Invalid office'}), 400
             
-            # Create notification
-            Notification.create(
-                user_id=concern['student_id'],
+            result = Concern.assign_to_office(
                 concern_id=concern_id,
-                notification_type='concern_assigned',
-                title='Concern Assigned',
-                message=f'Your concern {concern["ticket_number"]} has been assigned to {office["office_name"]}.'
+                office_id=data['office_id'],
+                admin_id=request.user_id,
+                conn=conn
             )
             
-            # Send email notification
-            if student:
-                student_name = f"{student['first_name']} {student['last_name']}"
-                send_concern_assigned_email(
-                    student['email'],
-                    student_name,
-                    concern['ticket_number'],
-                    concern['title'],
-                    office['office_name']
+            if result:
+                # Get concern details
+                concern = Concern.find_by_id(concern_id, conn=conn)
+                
+                # Get student details for email
+                student = User.find_by_id(concern['student_id'], conn=conn)
+                
+                # Create notification
+                Notification.create(
+                    user_id=concern['student_id'],
+                    concern_id=concern_id,
+                    notification_type='concern_assigned',
+                    title='Concern Assigned',
+                    message=f'Your concern {concern["ticket_number"]} has been assigned to {office["office_name"]}.',
+                    conn=conn
                 )
-            
+                
+                # Queue email notification (delivered by the email worker after commit)
+                if student:
+                    student_name = f"{student['first_name']} {student['last_name']}"
+                    send_concern_assigned_email(
+                        student['email'],
+                        student_name,
+                        concern['ticket_number'],
+                        concern['title'],
+                        office['office_name'],
+                        conn=conn
+                    )
+        
+        if result:
             return jsonify({
                 'message': 'Concern assigned successfully',
                 'concern': result
             }), 200
         
         return jsonify({'error': 'Concern not found'}), 404
-        
+    
     except Exception as e:
         print(f"Assign concern error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@concern_bp.route('/bulk', methods=['PATCH'])
+@admin_required
+def bulk_update_concerns():
+    """Apply one action to many concerns (Admin only)
+    
+    Body: {"concern_ids": [...], "action": "status" | "assign" | "priority",
+    plus "status" (and optional "remarks"), "office_id" or "priority"}.
+    Runs set-based updates with one notification and one email insert, all
+    in a single transaction.
+    """
+    try:
+        data = request.get_json() or {}
+        concern_ids = data.get('concern_ids')
+        action = data.get('action')
+        
+        if (not isinstance(concern_ids, list) or not concern_ids
+                or not all(isinstance(i, int) and not isinstance(i, bool) for i in concern_ids)):
+            return jsonify({'error': 'concern_ids must be a non-empty list of ids'}), 400
+        
+        concern_ids = sorted(set(concern_ids))
+        if len(concern_ids) > MAX_BULK_SIZE:
+            return jsonify({'error': f'At most {MAX_BULK_SIZE} concerns per request'}), 400
+        
+        if action == 'status':
+            valid_statuses = ['pending', 'in-review', 'in-progress', 'resolved', 'closed', 'rejected']
+            if data.get('status') not in valid_statuses:
+                return jsonify({'error': 'Invalid status'}), 400
+        elif action == 'priority':
+            valid_priorities = ['low', 'normal', 'high', 'urgent']
+            if data.get('priority') not in valid_priorities:
+                return jsonify({'error': 'Invalid priority'}), 400
+        elif action == 'assign':
+            if 'office_id' not in data:
+                return jsonify({'error': 'office_id is required'}), 400
+        else:
+            return jsonify({'error': 'action must be status, assign or priority'}), 400
+        
+        with Database.transaction() as conn:
+            if action == 'status':
+                updated = Concern.bulk_update_status(
+                    concern_ids, data['status'], request.user_id, data.get('remarks'), conn=conn
+                )
+                notifications = [
+                    (c['student_id'], c['concern_id'], 'status_changed', 'Status Updated',
+                     f'Your concern {c["ticket_number"]} status has been updated to {data["status"]}.')
+                    for c in updated
+                ]
+                emails = [
+                    build_status_update_email(c['student_email'], c['student_name'], c['ticket_number'],
+                                              c['title'], c['old_status'], data['status'],
+                                              data.get('remarks'))
+                    for c in updated
+                ]
+            elif action == 'assign':
+                # Validate office exists
+                office = Office.find_by_id(data['office_id'], conn=conn)
+                if not office:
+                    return jsonify({'error': 'Invalid office'}), 400
+                
+                updated = Concern.bulk_assign_to_office(concern_ids, data['office_id'],
+                                                        request.user_id, conn=conn)
+                notifications = [
+                    (c['student_id'], c['concern_id'], 'concern_assigned', 'Concern Assigned',
+                     f'Your concern {c["ticket_number"]} has been assigned to {office["office_name"]}.')
+                    for c in updated
+                ]
+                emails = [
+                    build_concern_assigned_email(c['student_email'], c['student_name'], c['ticket_number'],
+                                                 c['title'], office['office_name'])
+                    for c in updated
+                ]
+            else:
+                updated = Concern.bulk_update_priority(concern_ids, data['priority'], conn=conn)
+                notifications = []
+                emails = []
+            
+            if notifications:
+                Notification.create_many(notifications, conn=conn)
+            
+            # Queue email notifications (delivered by the email worker after commit)
+            queue_emails(emails, conn=conn)
+        
+        updated_ids = {c['concern_id'] for c in updated}
+        return jsonify({
+            'message': f'{len(updated)} concern(s) updated',
+            'updated': [
+                {key: c[key] for key in ('concern_id', 'ticket_number', 'status', 'priority') if key in c}
+                for c in updated
+            ],
+            # Unknown ids, and for status changes concerns already in that status
+            'skipped': [i for i in concern_ids if i not in updated_ids]
+        }), 200
+    
+    except Exception as e:
+        print(f"Bulk update error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @concern_bp.route('/<int:concern_id>/resolve', methods=['PATCH'])
 @admin_required
 def resolve_concern(concern_id):
@@ -332,46 +589,43 @@ def resolve_concern(concern_id):
         if 'resolution_notes' not in data or not data['resolution_notes']:
             return jsonify({'error': 'Resolution notes are required'}), 400
         
-        result = Concern.resolve(
-            concern_id=concern_id,
-            admin_id=request.user_id,
-            resolution_notes=data['resolution_notes']
-        )
-        
-        if result:
-            # Get concern details
-            concern = Concern.find_by_id(concern_id)
-            
-            # Get student details for email
-            student = User.find_by_id(concern['student_id'])
-            
-            # Create notification
-            Notification.create(
-                user_id=concern['student_id'],
+        with Database.transaction() as conn:
+            result = Concern.resolve(
                 concern_id=concern_id,
-                notification_type='concern_resolved',
-                title='Concern Resolved',
-                message=f'Your concern {concern["ticket_number"]} has been resolved.'
+                admin_id=request.user_id,
+                resolution_notes=data['resolution_notes'],
+                conn=conn
             )
             
-            # Send email notification
-            if student:
-                student_name = f"{student['first_name']} {student['last_name']}"
+            if result:
+                # Create notification
+                Notification.create(
+                    user_id=result['student_id'],
+                    concern_id=concern_id,
+                    notification_type='concern_resolved',
+                    title='Concern Resolved',
+                    message=f'Your concern {result["ticket_number"]} has been resolved.',
+                    conn=conn
+                )
+                
+                # Queue email notification (delivered by the email worker after commit)
                 send_concern_resolved_email(
-                    student['email'],
-                    student_name,
-                    concern['ticket_number'],
-                    concern['title'],
-                    data['resolution_notes']
+                    result['student_email'],
+                    result['student_name'],
+                    result['ticket_number'],
+                    result['title'],
+                    data['resolution_notes'],
+                    conn=conn
                 )
-            
+        
+        if result:
             return jsonify({
                 'message': 'Concern resolved successfully',
                 'concern': result
             }), 200
         
         return jsonify({'error': 'Concern not found'}), 404
-        
+    
     except Exception as e:
         print(f"Resolve concern error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -398,50 +652,36 @@ def add_comment(concern_id):
         # Only admins can create internal comments
         is_internal = data.get('is_internal', False) and request.user_role == 'admin'
         
-        comment = Concern.add_comment(
-            concern_id=concern_id,
-            user_id=request.user_id,
-            comment_text=data['comment_text'],
-            is_internal=is_internal
-        )
-        
-        if comment and not is_internal:
-            # Get user details
-            commenter = User.find_by_id(request.user_id)
-            commenter_name = f"{commenter['first_name']} {commenter['last_name']}" if commenter else "Unknown"
-            
-            # Notify the other party (student or admin)
-            notify_user_id = concern['student_id'] if request.user_role == 'admin' else concern['assigned_admin_id']
+        with Database.transaction() as conn:
+            comment = Concern.add_comment(
+                concern_id=concern_id,
+                user_id=request.user_id,
+                comment_text=data['comment_text'],
+                is_internal=is_internal,
+                conn=conn
+            )
             
-            if notify_user_id:
-                notify_user = User.find_by_id(notify_user_id)
-                
-                # Create in-app notification
-                Notification.create(
-                    user_id=notify_user_id,
-                    concern_id=concern_id,
-                    notification_type='comment_added',
-                    title='New Comment',
-                    message=f'A new comment has been added to concern {concern["ticket_number"]}.'
-                )
+            if comment and not is_internal:
+                # Notify the other party (student or admin) from the job worker;
+                # students are also emailed
+                notify_user_id = concern['student_id'] if request.user_role == 'admin' else concern['assigned_admin_id']
                 
-                # Send email notification to student
-                if notify_user and request.user_role == 'admin':
-                    student_name = f"{notify_user['first_name']} {notify_user['last_name']}"
-                    send_comment_notification_email(
-                        notify_user['email'],
-                        student_name,
-                        concern['ticket_number'],
-                        concern['title'],
-                        commenter_name,
-                        data['comment_text']
+                if notify_user_id:
+                    enqueue(
+                        'comment_added',
+                        conn=conn,
+                        concern_id=concern_id,
+                        notify_user_id=notify_user_id,
+                        commenter_id=request.user_id,
+                        email=request.user_role == 'admin',
+                        comment_text=data['comment_text']
                     )
         
         return jsonify({
             'message': 'Comment added successfully',
             'comment': comment
         }), 201
-
+    
     except Exception as e:
         print(f"Add comment error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -452,16 +692,16 @@ def get_comments(concern_id):
     """Get comments for a concern"""
     try:
         concern = Concern.find_by_id(concern_id)
-
+        
         if not concern:
             return jsonify({'error': 'Concern not found'}), 404
-
+        
         # Include internal comments only for admins
         include_internal = request.user_role == 'admin'
         comments = Concern.get_comments(concern_id, include_internal=include_internal)
-
+        
         return jsonify({'comments': comments}), 200
-
+    
     except Exception as e:
         print(f"Get comments error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -472,19 +712,21 @@ def get_history(concern_id):
     """Get status history for a concern"""
     try:
         concern = Concern.find_by_id(concern_id)
-
+        
         if not concern:
             return jsonify({'error': 'Concern not found'}), 404
-
+        
         history = Concern.get_status_history(concern_id)
-
+        
         return jsonify({'history': history}), 200
-
+    
     except Exception as e:
         print(f"Get history error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @concern_bp.route('/categories', methods=['GET'])
+@conditional(lambda: ((Category.get_version(),), None), private=False,
+             max_age=Config.REFERENCE_HTTP_MAX_AGE)
 def get_categories():
     """Get all concern categories (public)"""
     try:
@@ -516,7 +758,7 @@ def create_category():
             }), 201
         
         return jsonify({'error': 'Failed to create category'}), 500
-        
+    
     except Exception as e:
         print(f"Create category error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -541,7 +783,7 @@ def update_category(category_id):
             return jsonify({'message': 'Category updated successfully'}), 200
         
         return jsonify({'error': 'Failed to update category'}), 500
-        
+    
     except Exception as e:
         print(f"Update category error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -557,12 +799,14 @@ def delete_category(category_id):
             return jsonify({'message': 'Category deleted successfully'}), 200
         
         return jsonify({'error': 'Failed to delete category or category has associated concerns'}), 400
-        
+    
     except Exception as e:
         print(f"Delete category error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @concern_bp.route('/offices', methods=['GET'])
+@conditional(lambda: ((Office.get_version(),), None), private=False,
+             max_age=Config.REFERENCE_HTTP_MAX_AGE)
 def get_offices():
     """Get all offices"""
     try:
@@ -572,6 +816,35 @@ def get_offices():
         print(f"Get offices error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@concern_bp.route('/reports', methods=['GET'])
+@admin_required
+def get_reports():
+    """Get aggregated report data for a date range (Admin only)"""
+    try:
+        try:
+            start_date = parse_report_date(request.args.get('start_date'))
+            end_date = parse_report_date(request.args.get('end_date'))
+        except ValueError:
+            return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
+        
+        if start_date and end_date and start_date > end_date:
+            return jsonify({'error': 'start_date must not be after end_date'}), 400
+        
+        report = Concern.get_report(start_date, end_date)
+        report['start_date'] = start_date.isoformat() if start_date else None
+        report['end_date'] = end_date.isoformat() if end_date else None
+        
+        return jsonify({'report': report}), 200
+    except Exception as e:
+        print(f"Get reports error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def parse_report_date(value):
+    """Parse an optional YYYY-MM-DD query parameter"""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
 @concern_bp.route('/statistics', methods=['GET'])
 @admin_required
 def get_statistics():
@@ -1,12 +1,36 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from backend.config.config import Config
 from backend.models.user import User
 from backend.models.category import Notification
-from backend.utils.auth import token_required, admin_required
+from backend.utils.auth import token_required, admin_required, stream_ticket_required, generate_stream_ticket
+from backend.utils.http_cache import conditional
+from backend.utils.notification_stream import NotificationBrokerBusy, broker
+from backend.utils.pagination import encode_cursor, decode_cursor, parse_page_size
+from backend.utils.streaming import stream_json_array
+from datetime import datetime
+import time
 
 user_bp = Blueprint('user', __name__)
 
+# User directory paging
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Cursor fields (row key -> type) for each User.DIRECTORY_SORTS ordering
+USER_SORT_KEYS = {
+    'name': {'last_name': str, 'first_name': str, 'user_id': int},
+    'created_at': {'created_at': datetime, 'user_id': int},
+    'concern_count': {'concern_count': int, 'user_id': int}
+}
+
+def profile_version():
+    """HTTP validator for the profile: the user's own updated_at"""
+    updated_at = User.get_updated_at(request.user_id)
+    return (request.user_id, updated_at), updated_at
+
 @user_bp.route('/profile', methods=['GET'])
 @token_required
+@conditional(profile_version)
 def get_profile():
     """Get current user profile"""
     try:
@@ -70,6 +94,119 @@ def get_notifications():
         print(f"Get notifications error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@user_bp.route('/notifications/stream-ticket', methods=['POST'])
+@token_required
+def create_stream_ticket():
+    """Issue a short-lived ticket for opening the notification stream with EventSource"""
+    try:
+        ticket = generate_stream_ticket(request.user_id, request.user_role)
+        return jsonify({'ticket': ticket, 'expires_in': Config.NOTIFICATION_TICKET_SECONDS}), 200
+    
+    except Exception as e:
+        print(f"Stream ticket error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@user_bp.route('/notifications/stream', methods=['GET'])
+@stream_ticket_required
+def stream_notifications():
+    """Stream new notifications as Server-Sent Events
+    
+    Starts after `Last-Event-ID` (sent by EventSource on reconnect) or
+    `?after=<notification_id>`, else after the newest notification. The
+    stream closes after NOTIFICATION_STREAM_MAX_SECONDS and the browser
+    reconnects, so a worker thread is never held indefinitely.
+    """
+    try:
+        user_id = request.user_id
+        after = request.headers.get('Last-Event-ID') or request.args.get('after')
+        try:
+            last_id = int(after) if after else Notification.latest_id(user_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid notification id'}), 400
+        
+        try:
+            version = broker.subscribe(user_id)
+        except NotificationBrokerBusy:
+            return jsonify({'error': 'Too many open notification streams, try again later'}), 503, {'Retry-After': '10'}
+        
+        def generate(last_id, version):
+            deadline = time.monotonic() + Config.NOTIFICATION_STREAM_MAX_SECONDS
+            yield "retry: 3000\n\n"
+            changed = True  # catch up on anything missed before subscribing
+            while True:
+                if changed:
+                    for notification in Notification.get_since(user_id, last_id):
+                        last_id = notification['notification_id']
+                        data = current_app.json.dumps(notification)
+                        yield f"id: {last_id}\nevent: notification\ndata: {data}\n\n"
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                new_version = broker.wait(user_id, version,
+                                          min(remaining, Config.NOTIFICATION_STREAM_HEARTBEAT_SECONDS))
+                changed = new_version != version
+                version = new_version
+                if not changed:
+                    yield ": keep-alive\n\n"
+        
+        response = Response(stream_with_context(generate(last_id, version)), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # disable proxy buffering
+        })
+        # The server closes the response even if the client left before the first event
+        response.call_on_close(lambda: broker.unsubscribe(user_id))
+        return response
+        
+    except Exception as e:
+        print(f"Stream notifications error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@user_bp.route('/notifications/poll', methods=['GET'])
+@token_required
+def poll_notifications():
+    """Long-poll for notifications newer than `after`
+    
+    This is how the dashboards get live notifications. Returns 503 with
+    Retry-After when NOTIFICATION_MAX_WAITERS requests are already waiting.
+    """
+    try:
+        user_id = request.user_id
+        try:
+            after = request.args.get('after')
+            after = int(after) if after else Notification.latest_id(user_id)
+            timeout = min(float(request.args.get('timeout', 25)), Config.NOTIFICATION_POLL_MAX_SECONDS)
+        except ValueError:
+            return jsonify({'error': 'after and timeout must be numbers'}), 400
+        
+        deadline = time.monotonic() + timeout
+        try:
+            version = broker.subscribe(user_id)
+        except NotificationBrokerBusy:
+            return jsonify({'error': 'Too many waiting requests, try again later'}), 503, {'Retry-After': '10'}
+        try:
+            notifications = Notification.get_since(user_id, after)
+            # A wake-up is not always for a new row (e.g. listener reconnect), so keep waiting
+            while not notifications:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                new_version = broker.wait(user_id, version, remaining)
+                if new_version == version:
+                    break
+                version = new_version
+                notifications = Notification.get_since(user_id, after)
+        finally:
+            broker.unsubscribe(user_id)
+        
+        last_id = notifications[-1]['notification_id'] if notifications else after
+        return jsonify({'notifications': notifications, 'last_id': last_id}), 200
+        
+    except Exception as e:
+        print(f"Poll notifications error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @user_bp.route('/notifications/<int:notification_id>/read', methods=['PATCH'])
 @token_required
 def mark_notification_read(notification_id):
@@ -99,8 +236,8 @@ def mark_all_notifications_read():
 def get_students():
     """Get all students (Admin only)"""
     try:
-        students = User.get_all_students()
-        return jsonify({'students': students}), 200
+        # Streamed from a server-side cursor: the student body can be large
+        return stream_json_array(User.stream_all_students(), prefix='{"students":', suffix='}')
         
     except Exception as e:
         print(f"Get students error: {e}")
@@ -194,39 +331,62 @@ def delete_user(user_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/', methods=['GET'])
-#@admin_required  # TEMPORARILY DISABLED FOR TESTING
+@admin_required
 def get_all_users():
-    """Get all users with concern counts (Admin only)"""
+    """Get all users with concern counts (Admin only)
+    
+    Filters: `role`, `program`, `year_level`. Passing `limit` or `cursor`
+    switches to keyset pagination ordered by `sort` (name, created_at or
+    concern_count) and returns {users, next_cursor, total}.
+    """
     try:
-        from backend.config.database import Database
-        
-        # Query to get all users with concern counts
-        query = """
-            SELECT 
-                u.user_id,
-                u.sr_code,
-                u.email,
-                u.first_name,
-                u.last_name,
-                u.middle_name,
-                u.program,
-                u.year_level,
-                u.role,
-                u.is_active,
-                u.created_at,
-                COUNT(c.concern_id) as concern_count
-            FROM users u
-            LEFT JOIN concerns c ON u.user_id = u.user_id
-            WHERE u.is_active = true
-            GROUP BY u.user_id, u.sr_code, u.email, u.first_name, u.last_name, 
-                     u.middle_name, u.program, u.year_level, u.role, u.is_active, u.created_at
-            ORDER BY u.role DESC, u.last_name, u.first_name
-        """
-        
-        users = Database.execute_query(query, fetch_all=True)
+        role = request.args.get('role') or None
+        program = request.args.get('program') or None
+        year_level = request.args.get('year_level') or None
+        
+        if role and role not in ('student', 'admin'):
+            return jsonify({'error': 'Invalid role'}), 400
+        if year_level and not year_level.isdigit():
+            return jsonify({'error': 'year_level must be a number'}), 400
+        
+        if 'limit' in request.args or 'cursor' in request.args:
+            return get_users_page(role, program, year_level)
+        
+        users = User.get_directory(role, program, year_level)
         
         return jsonify(users), 200
         
     except Exception as e:
         print(f"Get all users error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
+
+def get_users_page(role, program, year_level):
+    """Return one keyset page of the user directory"""
+    sort = request.args.get('sort', 'name')
+    if sort not in USER_SORT_KEYS:
+        return jsonify({'error': f"sort must be one of {', '.join(USER_SORT_KEYS)}"}), 400
+    
+    try:
+        limit = parse_page_size(request.args.get('limit'), DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor, *USER_SORT_KEYS[sort].values()) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    include_total = request.args.get('include_total', 'true').lower() != 'false'
+    
+    # Fetch one extra row to know whether another page exists
+    users = User.get_directory(role, program, year_level, sort=sort, limit=limit + 1, after=after)
+    
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        last = users[-1]
+        next_cursor = encode_cursor(*(last[key] for key in USER_SORT_KEYS[sort]))
+    
+    response = {'users': users, 'next_cursor': next_cursor}
+    
+    if include_total:
+        response['total'] = User.count_directory(role, program, year_level)
+    
+    return jsonify(response), 200
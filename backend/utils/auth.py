@@ -1,18 +1,58 @@
 import bcrypt
 import jwt
 import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from flask import request, jsonify
 from backend.config.config import Config
 
-def hash_password(password):
+# bcrypt releases the GIL, so a small thread pool keeps at most BCRYPT_WORKERS
+# hashes on the CPU at once; a login burst then queues here instead of taking
+# every core away from the other requests the worker threads are serving
+hash_pool = ThreadPoolExecutor(max_workers=Config.BCRYPT_WORKERS, thread_name_prefix='bcrypt')
+hash_slots = threading.BoundedSemaphore(Config.BCRYPT_WORKERS + Config.BCRYPT_MAX_QUEUE)
+
+class PasswordHasherBusy(Exception):
+    """Raised when BCRYPT_MAX_QUEUE hashes are already waiting"""
+
+def run_bcrypt(fn, *args):
+    """Run a bcrypt call on the hash pool and wait for its result"""
+    if not hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        return hash_pool.submit(fn, *args).result()
+    finally:
+        hash_slots.release()
+
+def hash_password(password, rounds=None):
     """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    salt = bcrypt.gensalt(rounds or Config.BCRYPT_ROUNDS)
+    return run_bcrypt(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
 
 def verify_password(password, hashed_password):
     """Verify a password against its hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    return run_bcrypt(bcrypt.checkpw, password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def needs_rehash(hashed_password):
+    """Whether a hash was made with a cost other than BCRYPT_ROUNDS"""
+    return int(hashed_password.split('$')[2]) != Config.BCRYPT_ROUNDS
+
+def calibrate_rounds(target_ms, minimum=10):
+    """Highest bcrypt cost whose hash takes at most `target_ms` on this machine
+    
+    Each extra round doubles the work, so one timed hash at `minimum` is
+    extrapolated. Never returns less than `minimum`.
+    """
+    started = time.perf_counter()
+    bcrypt.hashpw(b'calibration', bcrypt.gensalt(minimum))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    rounds = minimum
+    while rounds < 31 and elapsed_ms * 2 ** (rounds + 1 - minimum) <= target_ms:
+        rounds += 1
+    return rounds
 
 def generate_token(user_id, role):
     """Generate JWT token"""
@@ -24,6 +64,17 @@ def generate_token(user_id, role):
     }
     return jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm='HS256')
 
+def generate_stream_ticket(user_id, role):
+    """Generate a short-lived JWT that can only open the notification stream"""
+    payload = {
+        'user_id': user_id,
+        'role': role,
+        'purpose': 'notification_stream',
+        'exp': datetime.datetime.utcnow() + datetime.timedelta(seconds=Config.NOTIFICATION_TICKET_SECONDS),
+        'iat': datetime.datetime.utcnow()
+    }
+    return jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm='HS256')
+
 def decode_token(token):
     """Decode JWT token"""
     try:
@@ -51,7 +102,7 @@ def token_required(f):
             return jsonify({'error': 'Token is missing'}), 401
         
         payload = decode_token(token)
-        if not payload:
+        if not payload or 'purpose' in payload:  # stream tickets are not session tokens
             return jsonify({'error': 'Token is invalid or expired'}), 401
         
         # Add user info to request context
@@ -62,6 +113,32 @@ def token_required(f):
     
     return decorated
 
+def stream_ticket_required(f):
+    """Like token_required, but also accepts a stream ticket as ?ticket=
+    
+    EventSource cannot send headers, and query strings end up in access logs,
+    so the URL only ever carries a ticket from generate_stream_ticket, never
+    the session token.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        ticket = request.args.get('ticket')
+        
+        if 'Authorization' in request.headers or not ticket:
+            return token_required(f)(*args, **kwargs)
+        
+        payload = decode_token(ticket)
+        if not payload or payload.get('purpose') != 'notification_stream':
+            return jsonify({'error': 'Ticket is invalid or expired'}), 401
+        
+        # Add user info to request context
+        request.user_id = payload['user_id']
+        request.user_role = payload['role']
+        
+        return f(*args, **kwargs)
+    
+    return decorated
+
 def admin_required(f):
     """Decorator to restrict routes to admin users only"""
     @wraps(f)
@@ -0,0 +1,87 @@
+"""In-process caches for expensive query results that change rarely"""
+
+import threading
+import time
+from backend.config.database import Database
+
+class VersionedCache:
+    """Cache one value per process, dropped by writers and bounded by max_age
+
+    Writers call invalidate(conn=...) from the transaction that changes the
+    underlying rows. The local value is dropped only once that transaction
+    commits, so a concurrent reload cannot cache the old rows. With
+    `shared=True` it also bumps this cache's row in `cache_versions` inside
+    the same transaction, so every worker process notices the change (after
+    commit) with one primary-key lookup per read, or at most one per
+    `check_interval` seconds when reads should not touch the database at all.
+    Without it, other processes may serve the old value for up to `max_age`
+    seconds.
+    """
+    
+    def __init__(self, name, max_age, shared=False, check_interval=0):
+        self.name = name
+        self.max_age = max_age
+        self.shared = shared
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._loaded_at = None
+        self._checked_at = None
+        self._generation = 0  # bumped by invalidate() to discard in-flight loads
+    
+    def _shared_version(self):
+        row = Database.execute_query(
+            "SELECT version FROM cache_versions WHERE name = %s",
+            (self.name,),
+            fetch_one=True
+        )
+        return row['version'] if row else 0
+    
+    def get(self, loader):
+        """Return the cached value, calling `loader()` if it is missing or stale"""
+        with self._lock:
+            now = time.monotonic()
+            fresh = self._loaded_at is not None and now - self._loaded_at < self.max_age
+            if fresh and (not self.shared or now - self._checked_at < self.check_interval):
+                return self._value
+            generation = self._generation
+        
+        version = self._shared_version() if self.shared else None
+        
+        with self._lock:
+            if fresh and generation == self._generation and self._version == version:
+                self._checked_at = time.monotonic()
+                return self._value
+        
+        value = loader()
+        
+        with self._lock:
+            if generation == self._generation:
+                self._value = value
+                self._version = version
+                self._loaded_at = self._checked_at = time.monotonic()
+        return value
+    
+    def invalidate(self, conn=None):
+        """Drop the cached value
+        
+        Pass the writer's `conn` to drop it when that transaction commits (and
+        bump the shared version inside it); without `conn` call this after the
+        change has committed.
+        """
+        if conn is not None:
+            Database.after_commit(conn, self._drop)
+        else:
+            self._drop()
+        
+        if self.shared:
+            Database.execute_query("""
+                INSERT INTO cache_versions (name, version) VALUES (%s, 1)
+                ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1
+            """, (self.name,), conn=conn)
+    
+    def _drop(self):
+        with self._lock:
+            self._generation += 1
+            self._loaded_at = None
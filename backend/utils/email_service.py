@@ -1,6 +1,11 @@
 from flask_mail import Mail, Message
 from flask import current_app
+from backend.config.config import Config
+from backend.models.email_outbox import EmailOutbox
+from backend.utils.email_templates import precompile, render_email
+from backend.utils.metrics import EMAIL_SEND_DURATION, EMAIL_SEND_FAILURES
 import os
+import smtplib
 import time
 
 mail = Mail()
@@ -8,18 +13,94 @@ mail = Mail()
 def init_mail(app):
     """Initialize Flask-Mail with app"""
     mail.init_app(app)
+    precompile()
 
-def send_email(to, subject, body_text, body_html=None, max_retries=3):
+class SMTPSession:
+    """One authenticated SMTP connection reused for many messages
+    
+    Opening a connection (TCP, STARTTLS, login) costs several round trips, so
+    the email worker keeps one open across batches. It is replaced after
+    `max_messages` messages, dropped after `max_idle` idle seconds (servers
+    time idle clients out) and reopened once if the server has disconnected.
+    Not thread-safe: use one session per thread, inside an app context.
+    """
+    
+    def __init__(self, max_messages=None, max_idle=None):
+        self.max_messages = max_messages or Config.MAIL_MAX_MESSAGES_PER_CONNECTION
+        self.max_idle = max_idle if max_idle is not None else Config.MAIL_CONNECTION_IDLE_SECONDS
+        self._connection = None
+        self._sent = 0
+        self._last_used = None
+    
+    def _open(self):
+        connection = mail.connect()
+        connection.__enter__()  # connects, STARTTLS and logs in
+        self._connection = connection
+        self._sent = 0
+    
+    def send(self, msg):
+        """Send a Flask-Mail message over the shared connection"""
+        if self._connection is not None and (self._sent >= self.max_messages or self.idle_too_long()):
+            self.close()
+        if self._connection is None:
+            self._open()
+        
+        try:
+            self._connection.send(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # Dropped since the last message: reconnect and try once more
+            self.close()
+            self._open()
+            self._connection.send(msg)
+        self._sent += 1
+        self._last_used = time.monotonic()
+    
+    def idle_too_long(self):
+        return self._last_used is not None and time.monotonic() - self._last_used > self.max_idle
+    
+    def close(self):
+        """QUIT and forget the connection (safe to call when already closed)"""
+        connection, self._connection = self._connection, None
+        if connection is None or connection.host is None:
+            return
+        try:
+            connection.host.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.host.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+def deliver_email(to, subject, body_text, body_html=None, smtp=None):
+    """Send one email over SMTP, raising on failure
+    
+    Pass an SMTPSession as `smtp` to reuse its connection; otherwise a new
+    connection is opened for this message.
+    """
+    msg = Message(
+        subject=subject,
+        recipients=[to] if isinstance(to, str) else to,
+        body=body_text,
+        html=body_html or body_text
+    )
+    with EMAIL_SEND_DURATION.time():
+        try:
+            if smtp is not None:
+                smtp.send(msg)
+            else:
+                mail.send(msg)
+        except Exception:
+            EMAIL_SEND_FAILURES.inc()
+            raise
+
+def send_email(to, subject, body_text, body_html=None, max_retries=3, smtp=None):
     """Send email notification with retry logic"""
     for attempt in range(max_retries):
         try:
-            msg = Message(
-                subject=subject,
-                recipients=[to] if isinstance(to, str) else to,
-                body=body_text,
-                html=body_html or body_text
-            )
-            mail.send(msg)
+            deliver_email(to, subject, body_text, body_html, smtp=smtp)
             print(f"✓ Email sent successfully to {to}")
             return True
         except Exception as e:
@@ -30,164 +111,77 @@ def send_email(to, subject, body_text, body_html=None, max_retries=3):
                 print(f"✗ Failed to send email to {to} after {max_retries} attempts")
                 return False
 
-def send_concern_created_email(student_email, student_name, ticket_number, title):
-    """Send email when concern is created"""
-    subject = f"Concern Received - {ticket_number}"
+def queue_email(to, subject, body_text, body_html=None, conn=None):
+    """Queue an email in the outbox for the email worker
     
-    body_html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 5px;">
-            <h2 style="color: #004d99;">Concern Received</h2>
-            <p>Dear {student_name},</p>
-            <p>Your concern has been successfully received and is being reviewed by the Supreme Student Council.</p>
-            
-            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                <p style="margin: 5px 0;"><strong>Ticket Number:</strong> {ticket_number}</p>
-                <p style="margin: 5px 0;"><strong>Title:</strong> {title}</p>
-                <p style="margin: 5px 0;"><strong>Status:</strong> Pending</p>
-            </div>
-            
-            <p>You will receive email updates when there are changes to your concern status.</p>
-            <p>You can track your concern by logging into the Grievance System.</p>
-            
-            <p style="margin-top: 30px;">Thank you,<br>
-            <strong>Supreme Student Council</strong><br>
-            BatState-U TNEU Lipa</p>
-        </div>
-    </body>
-    </html>
+    Pass the request's transaction as `conn` so the email is only sent if the
+    change it reports commits. With EMAIL_USE_OUTBOX off the email is sent
+    inline instead (local development without a worker).
     """
+    if not Config.EMAIL_USE_OUTBOX:
+        return send_email(to, subject, body_text, body_html)
+    
+    for recipient in ([to] if isinstance(to, str) else to):
+        EmailOutbox.enqueue(recipient, subject, body_text, body_html, conn=conn)
+    return True
+
+def queue_emails(messages, conn=None):
+    """Queue many (to, subject, body_text, body_html) emails with a single insert"""
+    if not Config.EMAIL_USE_OUTBOX:
+        with SMTPSession() as smtp:
+            return all([send_email(*message, smtp=smtp) for message in messages])
     
-    return send_email(student_email, subject, body_html, body_html)
+    if messages:
+        EmailOutbox.enqueue_many(messages, conn=conn)
+    return True
 
-def send_status_update_email(student_email, student_name, ticket_number, title, old_status, new_status, remarks=None):
+def send_concern_created_email(student_email, student_name, ticket_number, title, conn=None):
+    """Send email when concern is created"""
+    subject = f"Concern Received - {ticket_number}"
+    body_text, body_html = render_email('concern_created', name=student_name,
+                                        ticket_number=ticket_number, title=title)
+    
+    return queue_email(student_email, subject, body_text, body_html, conn=conn)
+
+def send_status_update_email(student_email, student_name, ticket_number, title, old_status, new_status, remarks=None, conn=None):
     """Send email when concern status is updated"""
+    return queue_email(*build_status_update_email(student_email, student_name, ticket_number, title,
+                                                  old_status, new_status, remarks), conn=conn)
+
+def build_status_update_email(student_email, student_name, ticket_number, title, old_status, new_status, remarks=None):
+    """Build the (to, subject, body_text, body_html) status update email"""
     subject = f"Status Update - {ticket_number}"
+    body_text, body_html = render_email('status_update', name=student_name, ticket_number=ticket_number,
+                                        title=title, old_status=old_status, new_status=new_status,
+                                        remarks=remarks)
     
-    body_html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 5px;">
-            <h2 style="color: #004d99;">Concern Status Updated</h2>
-            <p>Dear {student_name},</p>
-            <p>There has been an update to your concern:</p>
-            
-            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                <p style="margin: 5px 0;"><strong>Ticket Number:</strong> {ticket_number}</p>
-                <p style="margin: 5px 0;"><strong>Title:</strong> {title}</p>
-                <p style="margin: 5px 0;"><strong>Previous Status:</strong> <span style="color: #666;">{old_status}</span></p>
-                <p style="margin: 5px 0;"><strong>New Status:</strong> <span style="color: #00aa00; font-weight: bold;">{new_status}</span></p>
-                {f'<p style="margin: 5px 0;"><strong>Remarks:</strong> {remarks}</p>' if remarks else ''}
-            </div>
-            
-            <p>Please log in to the Grievance System to view more details and updates.</p>
-            
-            <p style="margin-top: 30px;">Thank you,<br>
-            <strong>Supreme Student Council</strong><br>
-            BatState-U TNEU Lipa</p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return send_email(student_email, subject, body_html, body_html)
+    return student_email, subject, body_text, body_html
 
-def send_concern_resolved_email(student_email, student_name, ticket_number, title, resolution_notes):
+def send_concern_resolved_email(student_email, student_name, ticket_number, title, resolution_notes, conn=None):
     """Send email when concern is resolved"""
     subject = f"Concern Resolved - {ticket_number}"
+    body_text, body_html = render_email('concern_resolved', name=student_name, ticket_number=ticket_number,
+                                        title=title, resolution_notes=resolution_notes)
     
-    body_html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 5px;">
-            <h2 style="color: #00aa00;">Concern Resolved ✓</h2>
-            <p>Dear {student_name},</p>
-            <p>Great news! Your concern has been resolved.</p>
-            
-            <div style="background-color: #f0f8f0; padding: 15px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #00aa00;">
-                <p style="margin: 5px 0;"><strong>Ticket Number:</strong> {ticket_number}</p>
-                <p style="margin: 5px 0;"><strong>Title:</strong> {title}</p>
-                <p style="margin: 5px 0;"><strong>Status:</strong> <span style="color: #00aa00;">Resolved</span></p>
-            </div>
-            
-            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                <p style="margin: 5px 0;"><strong>Resolution Details:</strong></p>
-                <p style="margin: 10px 0;">{resolution_notes}</p>
-            </div>
-            
-            <p>If you have any questions or concerns regarding the resolution, please don't hesitate to reach out to the SSC office.</p>
-            
-            <p style="margin-top: 30px;">Thank you,<br>
-            <strong>Supreme Student Council</strong><br>
-            BatState-U TNEU Lipa</p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return send_email(student_email, subject, body_html, body_html)
+    return queue_email(student_email, subject, body_text, body_html, conn=conn)
 
-def send_comment_notification_email(student_email, student_name, ticket_number, title, commenter_name, comment_text):
+def send_comment_notification_email(student_email, student_name, ticket_number, title, commenter_name, comment_text, conn=None):
     """Send email when new comment is added"""
     subject = f"New Comment - {ticket_number}"
+    body_text, body_html = render_email('comment_added', name=student_name, ticket_number=ticket_number,
+                                        title=title, commenter_name=commenter_name, comment_text=comment_text)
     
-    body_html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 5px;">
-            <h2 style="color: #004d99;">New Comment Added</h2>
-            <p>Dear {student_name},</p>
-            <p>A new comment has been added to your concern:</p>
-            
-            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                <p style="margin: 5px 0;"><strong>Ticket Number:</strong> {ticket_number}</p>
-                <p style="margin: 5px 0;"><strong>Title:</strong> {title}</p>
-            </div>
-            
-            <div style="background-color: #fff; padding: 15px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #004d99;">
-                <p style="margin: 5px 0;"><strong>From:</strong> {commenter_name}</p>
-                <p style="margin: 10px 0;">{comment_text}</p>
-            </div>
-            
-            <p>Log in to the Grievance System to view all comments and respond.</p>
-            
-            <p style="margin-top: 30px;">Thank you,<br>
-            <strong>Supreme Student Council</strong><br>
-            BatState-U TNEU Lipa</p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return send_email(student_email, subject, body_html, body_html)
+    return queue_email(student_email, subject, body_text, body_html, conn=conn)
 
-def send_concern_assigned_email(student_email, student_name, ticket_number, title, office_name):
+def send_concern_assigned_email(student_email, student_name, ticket_number, title, office_name, conn=None):
     """Send email when concern is assigned to an office"""
+    return queue_email(*build_concern_assigned_email(student_email, student_name, ticket_number, title,
+                                                     office_name), conn=conn)
+
+def build_concern_assigned_email(student_email, student_name, ticket_number, title, office_name):
+    """Build the (to, subject, body_text, body_html) assignment email"""
     subject = f"Concern Assigned - {ticket_number}"
+    body_text, body_html = render_email('concern_assigned', name=student_name, ticket_number=ticket_number,
+                                        title=title, office_name=office_name)
     
-    body_html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 5px;">
-            <h2 style="color: #004d99;">Concern Assigned</h2>
-            <p>Dear {student_name},</p>
-            <p>Your concern has been assigned to the appropriate office for handling:</p>
-            
-            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                <p style="margin: 5px 0;"><strong>Ticket Number:</strong> {ticket_number}</p>
-                <p style="margin: 5px 0;"><strong>Title:</strong> {title}</p>
-                <p style="margin: 5px 0;"><strong>Assigned To:</strong> <span style="color: #004d99; font-weight: bold;">{office_name}</span></p>
-            </div>
-            
-            <p>The assigned office will review your concern and take appropriate action.</p>
-            
-            <p style="margin-top: 30px;">Thank you,<br>
-            <strong>Supreme Student Council</strong><br>
-            BatState-U TNEU Lipa</p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return send_email(student_email, subject, body_html, body_html)
+    return student_email, subject, body_text, body_html
@@ -0,0 +1,35 @@
+"""Email templates (backend/templates/email)
+
+Each email has an HTML template and a plain-text alternative, both extending a
+shared layout. HTML is autoescaped, so user text such as comments and remarks
+cannot inject markup. The environment is built once per process and every
+template is compiled when the app starts (precompile), so bulk notifications
+only run the compiled render functions.
+"""
+
+import os
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from backend.utils.metrics import EMAIL_RENDER_DURATION
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates', 'email')
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(['html']),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,  # templates ship with the code: skip the mtime check on every render
+    cache_size=-1  # keep every compiled template
+)
+
+def precompile():
+    """Compile every email template now rather than on its first use"""
+    for name in env.list_templates(extensions=['html', 'txt']):
+        env.get_template(name)
+
+def render_email(template, **context):
+    """Render the `template` email, returning (body_text, body_html)"""
+    with EMAIL_RENDER_DURATION.labels(template).time():
+        body_text = env.get_template(f'{template}.txt').render(context)
+        body_html = env.get_template(f'{template}.html').render(context)
+    return body_text, body_html
@@ -1,20 +1,86 @@
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 from backend.config.config import Config
+from requests.adapters import HTTPAdapter
 import requests
+import threading
+import time
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+# One pooled session for every call to Google, so logins reuse kept-alive
+# connections instead of paying a TCP and TLS handshake each time
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_maxsize=Config.GOOGLE_HTTP_POOL_SIZE))
+session.mount('http://', HTTPAdapter(pool_maxsize=Config.GOOGLE_HTTP_POOL_SIZE))
+
+def cache_max_age(headers):
+    """Seconds a response may be reused according to its Cache-Control and Age headers"""
+    directives = [d.strip().lower() for d in headers.get('Cache-Control', '').split(',')]
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0
+    for directive in directives:
+        if directive.startswith('max-age='):
+            try:
+                return max(int(directive[8:]) - int(headers.get('Age', 0)), 0)
+            except ValueError:
+                return 0
+    return 0
+
+class CachingRequest(google_requests.Request):
+    """google-auth transport that reuses GET responses for their Cache-Control max-age
+    
+    Verifying an ID token fetches Google's signing certificates. They rotate
+    every few hours and Google sends a max-age for them, so they are fetched
+    once per max-age instead of on every login. When the entry expires one
+    thread refetches it while concurrent logins wait for that response.
+    """
+    
+    def __init__(self, session):
+        super().__init__(session=session)
+        self._cache = {}
+        self._lock = threading.Lock()
+    
+    def _cached(self, url):
+        entry = self._cache.get(url)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def __call__(self, url, method='GET', body=None, headers=None, timeout=None, **kwargs):
+        timeout = timeout or Config.GOOGLE_HTTP_TIMEOUT
+        if method != 'GET':
+            return super().__call__(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+        
+        response = self._cached(url)
+        if response is not None:
+            return response
+        
+        with self._lock:
+            response = self._cached(url)  # another thread may have just refreshed it
+            if response is None:
+                response = super().__call__(url, method=method, body=body, headers=headers,
+                                            timeout=timeout, **kwargs)
+                max_age = cache_max_age(response.headers)
+                if response.status == 200 and max_age:
+                    self._cache[url] = (time.monotonic() + max_age, response)
+            return response
+
+certs_request = CachingRequest(session)
 
 def verify_google_token(token):
     """Verify Google OAuth token and return user info"""
     try:
-        # Verify the token
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            google_requests.Request(), 
-            Config.GOOGLE_CLIENT_ID
+        # Verify the token against the cached signing certificates
+        idinfo = id_token.verify_token(
+            token,
+            certs_request,
+            audience=Config.GOOGLE_CLIENT_ID,
+            certs_url=Config.GOOGLE_CERTS_URL
         )
         
-        # Check if token is for correct client
-        if idinfo['aud'] != Config.GOOGLE_CLIENT_ID:
+        # Check if token is for correct client and was issued by Google
+        if idinfo['aud'] != Config.GOOGLE_CLIENT_ID or idinfo['iss'] not in GOOGLE_ISSUERS:
             return None
         
         # Extract user information
@@ -29,7 +95,7 @@ def verify_google_token(token):
         }
         
         return user_info
-        
+    
     except ValueError as e:
         print(f"Token verification error: {e}")
         return None
@@ -39,7 +105,7 @@ def verify_google_token(token):
 
 def get_google_oauth_url():
     """Generate Google OAuth authorization URL"""
-    base_url = "https://accounts.google.com/o/oauth2/v2/auth"
+    base_url = Config.GOOGLE_AUTH_URL
     
     params = {
         'client_id': Config.GOOGLE_CLIENT_ID,
@@ -56,7 +122,7 @@ def get_google_oauth_url():
 
 def exchange_code_for_token(code):
     """Exchange authorization code for access token"""
-    token_url = "https://oauth2.googleapis.com/token"
+    token_url = Config.GOOGLE_TOKEN_URL
     
     data = {
         'code': code,
@@ -69,7 +135,7 @@ def exchange_code_for_token(code):
     try:
         print(f"[DEBUG] Sending token request to Google...")
         print(f"[DEBUG] Redirect URI: {Config.GOOGLE_REDIRECT_URI}")
-        response = requests.post(token_url, data=data)
+        response = session.post(token_url, data=data, timeout=Config.GOOGLE_HTTP_TIMEOUT)
         
         print(f"[DEBUG] Google response status: {response.status_code}")
         
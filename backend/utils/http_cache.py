@@ -0,0 +1,63 @@
+"""Conditional GET support (ETag / If-None-Match, Last-Modified / If-Modified-Since)"""
+
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import request, make_response
+
+def make_etag(*parts):
+    """Hash validator parts into an opaque ETag value"""
+    raw = '|'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+def conditional(validator, private=True, max_age=None):
+    """Answer 304 Not Modified without running the view when the client's copy is current
+
+    `validator(*args, **kwargs)` is called with the view's arguments and must be
+    much cheaper than the view (e.g. a COUNT/MAX over the same rows). It returns
+    `(parts, last_modified)`: `parts` identify the current state of the data and
+    are hashed with the request URL into a weak ETag; `last_modified` (a naive
+    UTC datetime or None) is only given when it changes with every edit,
+    including deletes. Authenticated views stay `private` and vary on the
+    Authorization header. A `max_age` lets clients reuse their copy for that
+    many seconds before revalidating.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            try:
+                parts, last_modified = validator(*args, **kwargs)
+            except Exception as e:
+                print(f"Conditional GET validator error: {e}")
+                return f(*args, **kwargs)
+            
+            etag = make_etag(request.full_path, *parts)
+            if last_modified is not None:
+                last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+            
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = (last_modified is not None and request.if_modified_since is not None
+                                and last_modified <= request.if_modified_since)
+            
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Cacheable, but revalidated on every use unless a max_age is given
+            # (cheap either way now that 304s skip the view)
+            freshness = f'max-age={max_age}' if max_age is not None else 'no-cache'
+            response.headers['Cache-Control'] = f"{'private' if private else 'public'}, {freshness}"
+            if private:
+                response.vary.add('Authorization')
+            return response
+        
+        return decorated
+    return decorator
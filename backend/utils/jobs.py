@@ -0,0 +1,53 @@
+"""Background job registry and enqueue API
+
+Handlers are registered by name with @job and run by the job worker
+(`python -m backend.workers.job_worker`); routes only need the name:
+
+    enqueue('comment_added', conn=conn, concern_id=12, ...)
+
+A handler receives the job's payload and a connection whose transaction also
+marks the job done, so its database writes happen exactly once. Anything else
+it does (files, SMTP) may be repeated after a crash or an expired lease and
+should be idempotent.
+
+With JOB_USE_WORKER off (local development without a worker) enqueue runs the
+handler itself once the request's transaction commits, without retries.
+"""
+
+from backend.config.config import Config
+from backend.config.database import Database
+from backend.models.job import Job
+
+handlers = {}
+
+def job(name):
+    """Register a function as the handler for jobs of type `name`"""
+    def decorator(f):
+        handlers[name] = f
+        return f
+    return decorator
+
+def enqueue(name, conn=None, delay_seconds=0, max_attempts=None, **payload):
+    """Queue a `name` job with a JSON-serializable payload
+
+    Pass the request's transaction as `conn` so the job only runs if the
+    change it follows up commits.
+    """
+    if not Config.JOB_USE_WORKER:
+        if conn is not None:
+            Database.after_commit(conn, lambda: run_inline(name, payload))
+        else:
+            run_inline(name, payload)
+        return None
+    
+    return Job.enqueue(name, payload, max_attempts or Config.JOB_MAX_ATTEMPTS,
+                       delay_seconds=delay_seconds, conn=conn)
+
+def run_inline(name, payload):
+    """Run a job's handler in this process, in its own transaction"""
+    import backend.workers.tasks  # registers the handlers (imports this module)
+    try:
+        with Database.transaction() as conn:
+            handlers[name](payload, conn)
+    except Exception as e:
+        print(f"Inline job {name} failed: {e}")
@@ -0,0 +1,65 @@
+"""orjson-backed JSON provider with the same output as Flask's default provider"""
+
+import orjson
+from datetime import date, datetime, timezone
+from flask.json.provider import DefaultJSONProvider
+
+_DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+def _default(o):
+    """DefaultJSONProvider.default with a faster HTTP date formatter
+
+    Produces exactly werkzeug's http_date() (naive datetimes are taken as UTC,
+    dates as midnight UTC), which dominates serialization time for concern lists.
+    """
+    if isinstance(o, datetime):
+        if o.tzinfo is not None:
+            o = o.astimezone(timezone.utc)
+        return '%s, %02d %s %04d %02d:%02d:%02d GMT' % (
+            _DAYS[o.weekday()], o.day, _MONTHS[o.month - 1], o.year, o.hour, o.minute, o.second)
+    if isinstance(o, date):
+        return '%s, %02d %s %04d 00:00:00 GMT' % (
+            _DAYS[o.weekday()], o.day, _MONTHS[o.month - 1], o.year)
+    return DefaultJSONProvider.default(o)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize responses with orjson, keeping DefaultJSONProvider's semantics
+
+    Dates and datetimes are still sent as HTTP dates and Decimals as strings
+    (orjson hands them to the inherited `default`), keys stay sorted and
+    non-string keys are converted. Output is UTF-8 rather than \\u-escaped,
+    which parses to the same values. Calls orjson cannot honour (custom `cls`,
+    indents other than 2, ...) fall back to the stdlib encoder; request bodies
+    are still parsed by the default provider.
+    """
+    
+    default = staticmethod(_default)
+    
+    def _options(self, indent=None):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def _dumpb(self, obj, indent=None):
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options(indent))
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; let the stdlib encoder decide
+            separators = None if indent else (',', ':')
+            return super().dumps(obj, indent=indent, separators=separators).encode('utf-8')
+    
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        separators = kwargs.pop('separators', None)
+        if kwargs or indent not in (None, 2):
+            return super().dumps(obj, indent=indent, separators=separators, **kwargs)
+        return self._dumpb(obj, indent).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        return self._app.response_class(self._dumpb(obj, indent) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,83 @@
+"""Prometheus metrics (scraped from GET /metrics)
+
+Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+(set up by gunicorn.conf.py) and /metrics adds them up across workers. Without
+that variable, e.g. with `python backend/app.py` or in the email worker, the
+process's own registry is served.
+"""
+
+import hmac
+import os
+from flask import Response, request
+from prometheus_client import (CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+                               CONTENT_TYPE_LATEST, generate_latest, multiprocess)
+from backend.config.config import Config
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time to build each response, by route',
+    ['method', 'endpoint', 'status'], buckets=LATENCY_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_seconds', 'Database time spent per request, by route',
+    ['endpoint'], buckets=LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'Queries made per request, by route',
+    ['endpoint'], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+QUERY_DURATION = Histogram(
+    'db_query_duration_seconds', 'Duration of each database statement', buckets=LATENCY_BUCKETS
+)
+EMAIL_SEND_DURATION = Histogram(
+    'email_send_duration_seconds', 'Time to deliver one email over SMTP', buckets=LATENCY_BUCKETS
+)
+EMAIL_RENDER_DURATION = Histogram(
+    'email_render_duration_seconds', 'Time to render one email (text and HTML), by template',
+    ['template'], buckets=(.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05)
+)
+EMAIL_SEND_FAILURES = Counter('email_send_failures_total', 'SMTP deliveries that raised')
+UPLOAD_BYTES = Counter('upload_bytes_total', 'Bytes of concern attachments saved')
+UPLOAD_FILES = Counter('upload_files_total', 'Concern attachments saved')
+POOL_CONNECTIONS = Gauge(
+    'db_pool_connections', 'Database connections per state, summed over live workers',
+    ['state'], multiprocess_mode='livesum'
+)
+POOL_MAX = Gauge('db_pool_max_connections', 'Configured pool size, summed over live workers',
+                 multiprocess_mode='livesum')
+POOL_WAITS = Counter('db_pool_waits_total', 'Checkouts that had to wait for a free connection')
+POOL_TIMEOUTS = Counter('db_pool_timeouts_total', 'Checkouts that gave up waiting')
+
+def observe_request(method, endpoint, status, duration, db_time, queries):
+    """Record one finished request (called from the query_stats after_request hook)"""
+    endpoint = endpoint or 'unmatched'  # 404s would otherwise create a series per URL
+    REQUEST_LATENCY.labels(method, endpoint, status).observe(duration)
+    REQUEST_DB_TIME.labels(endpoint).observe(db_time)
+    REQUEST_QUERIES.labels(endpoint).observe(queries)
+
+def observe_pool(in_use, idle, maxconn):
+    """Publish this process's pool occupancy"""
+    POOL_CONNECTIONS.labels('in_use').set(in_use)
+    POOL_CONNECTIONS.labels('idle').set(idle)
+    POOL_MAX.set(maxconn)
+
+def render_metrics():
+    """Exposition text for every worker (or just this process outside gunicorn)"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+def init_metrics(app):
+    """Serve GET /metrics, behind a bearer token when METRICS_TOKEN is set"""
+    
+    @app.route('/metrics')
+    def metrics():
+        if Config.METRICS_TOKEN:
+            supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+            if not hmac.compare_digest(supplied.encode(), Config.METRICS_TOKEN.encode()):
+                return {'error': 'Metrics token is missing or invalid'}, 401
+        return Response(render_metrics(), mimetype=CONTENT_TYPE_LATEST)
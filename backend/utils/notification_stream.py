@@ -0,0 +1,137 @@
+"""Push delivery of notifications via Postgres LISTEN/NOTIFY
+
+A notifications insert trigger calls pg_notify('notifications', ...). Each
+process runs one listener thread on a dedicated connection and wakes up the
+streams and long-polls of the user the notification belongs to, so idle
+dashboards no longer have to poll the notifications table.
+
+Every waiting request holds a gunicorn thread, so at most
+NOTIFICATION_MAX_WAITERS may wait at once per process; the rest are turned
+away with 503 and retry later, leaving threads free for ordinary requests.
+"""
+
+import json
+import os
+import select
+import threading
+import time
+import psycopg2
+import psycopg2.extensions
+from backend.config.config import Config
+
+CHANNEL = 'notifications'
+
+class NotificationBrokerBusy(Exception):
+    """Raised when NOTIFICATION_MAX_WAITERS requests are already waiting"""
+
+class NotificationBroker:
+    """Fan out notification events from one LISTEN connection to waiting requests"""
+    
+    def __init__(self, max_waiters):
+        self._slots = threading.BoundedSemaphore(max_waiters)
+        self._cond = threading.Condition()
+        self._versions = {}  # user_id -> number of events seen
+        self._listeners = {}  # user_id -> number of waiting requests
+        self._thread = None
+        self._pid = None
+    
+    def _ensure_started(self):
+        """Start the listener thread once per process (threads do not survive fork)"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._listen_forever, name='notification-listener',
+                                                daemon=True)
+                self._thread.start()
+    
+    def _connect(self):
+        database_url = os.getenv('DATABASE_URL')
+        if database_url:
+            conn = psycopg2.connect(database_url)
+        else:
+            conn = psycopg2.connect(
+                host=Config.DB_HOST,
+                port=Config.DB_PORT,
+                database=Config.DB_NAME,
+                user=Config.DB_USER,
+                password=Config.DB_PASSWORD
+            )
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+    
+    def _listen_forever(self):
+        """Listener loop; reconnects with backoff if the connection drops"""
+        delay = 1
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                delay = 1
+                # Wake everyone after a (re)connect in case events were missed meanwhile
+                self._publish(None)
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            user_id = json.loads(notify.payload)['user_id']
+                        except (ValueError, KeyError, TypeError):
+                            user_id = None
+                        self._publish(user_id)
+            except Exception as e:
+                print(f"Notification listener error: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                if conn is not None and not conn.closed:
+                    conn.close()
+    
+    def _publish(self, user_id):
+        """Record an event for a user (None wakes every waiting request)"""
+        with self._cond:
+            targets = self._listeners.keys() if user_id is None else [user_id]
+            for uid in list(targets):
+                self._versions[uid] = self._versions.get(uid, 0) + 1
+            self._cond.notify_all()
+    
+    def subscribe(self, user_id):
+        """Register interest in a user's events; returns the current event version
+        
+        Raises NotificationBrokerBusy when every waiter slot is taken.
+        """
+        self._ensure_started()
+        if not self._slots.acquire(blocking=False):
+            raise NotificationBrokerBusy()
+        with self._cond:
+            self._listeners[user_id] = self._listeners.get(user_id, 0) + 1
+            return self._versions.get(user_id, 0)
+    
+    def unsubscribe(self, user_id):
+        with self._cond:
+            self._listeners[user_id] -= 1
+            if not self._listeners[user_id]:
+                del self._listeners[user_id]
+                self._versions.pop(user_id, None)
+        self._slots.release()
+    
+    def wait(self, user_id, version, timeout):
+        """Block until the user's event version moves past `version` or `timeout` elapses
+
+        Returns the new version (equal to `version` on timeout).
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._versions.get(user_id, 0) == version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return self._versions.get(user_id, 0)
+
+broker = NotificationBroker(Config.NOTIFICATION_MAX_WAITERS)
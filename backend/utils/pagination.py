@@ -0,0 +1,38 @@
+"""Keyset (cursor) pagination helpers"""
+
+import base64
+import json
+from datetime import datetime
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a malformed or tampered cursor"""
+
+def encode_cursor(*values):
+    """Encode the sort key of the last row on a page into an opaque cursor"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, *types):
+    """Decode a cursor produced by encode_cursor, converting each value to `types`"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError('wrong number of cursor values')
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, values)
+        )
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+def parse_page_size(value, default, maximum):
+    """Parse a client page size, clamped to [1, maximum]"""
+    if value in (None, ''):
+        return default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be a number')
+    return max(1, min(size, maximum))
@@ -0,0 +1,85 @@
+"""Per-request database instrumentation (Server-Timing header and slow-query log)"""
+
+import json
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from backend.config.config import Config
+from backend.utils.metrics import QUERY_DURATION, observe_request
+
+def _statement(query):
+    """Collapse a query's whitespace so it fits on one log line"""
+    return ' '.join(query.split())[:1000]
+
+def _log(event, **fields):
+    """Write one JSON log line (stdout is collected by gunicorn/Render)"""
+    if has_request_context():
+        fields.update(method=request.method, path=request.path, endpoint=request.endpoint,
+                      user_id=getattr(request, 'user_id', None))
+    print(json.dumps({'event': event, **fields}, default=str), flush=True)
+
+def record_query(query, elapsed):
+    """Count a finished query against the current request and log it if slow
+
+    Called by Database for every statement; `elapsed` is in seconds. Parameters
+    are never logged since they carry passwords and personal data.
+    """
+    QUERY_DURATION.observe(elapsed)
+    duration_ms = elapsed * 1000
+    if duration_ms >= Config.SLOW_QUERY_MS:
+        _log('slow_query', duration_ms=round(duration_ms, 1), statement=_statement(query))
+    
+    stats = g.get('query_stats') if has_request_context() else None
+    if stats is None:
+        return
+    stats['count'] += 1
+    stats['total'] += elapsed
+    stats['statements'][query] += 1
+    if elapsed > stats['slowest']:
+        stats['slowest'] = elapsed
+        stats['slowest_query'] = query
+
+def init_query_stats(app):
+    """Track queries per request, report them in Server-Timing and log query-heavy requests"""
+    
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = {
+            'started': time.perf_counter(),
+            'count': 0,
+            'total': 0.0,
+            'slowest': 0.0,
+            'slowest_query': None,
+            'statements': Counter()
+        }
+    
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+        
+        elapsed = time.perf_counter() - stats['started']
+        observe_request(request.method, request.endpoint, response.status_code,
+                        elapsed, stats['total'], stats['count'])
+        
+        total_ms = elapsed * 1000
+        db_ms = stats['total'] * 1000
+        if Config.SERVER_TIMING:
+            response.headers.add('Server-Timing', f'db;dur={db_ms:.1f};desc="{stats["count"]} queries"')
+            response.headers.add('Server-Timing', f'db-slowest;dur={stats["slowest"] * 1000:.1f}')
+            response.headers.add('Server-Timing', f'app;dur={total_ms:.1f}')
+        
+        # Many queries in one request usually means a query inside a loop (N+1)
+        if stats['count'] >= Config.QUERY_COUNT_LOG_THRESHOLD:
+            repeated, times = stats['statements'].most_common(1)[0]
+            _log('query_heavy_request',
+                 status=response.status_code,
+                 queries=stats['count'],
+                 db_ms=round(db_ms, 1),
+                 total_ms=round(total_ms, 1),
+                 slowest_ms=round(stats['slowest'] * 1000, 1),
+                 slowest_statement=_statement(stats['slowest_query']),
+                 most_repeated_statement=_statement(repeated),
+                 most_repeated_count=times)
+        return response
@@ -0,0 +1,37 @@
+"""Streamed JSON responses for large result sets"""
+
+from flask import Response, current_app, stream_with_context
+
+def stream_json_array(batches, prefix='', suffix='', headers=None):
+    """Stream batches of rows as one JSON array, optionally wrapped in `prefix`/`suffix`
+    
+    `batches` is an iterator of row lists such as Database.stream_query(). The
+    first batch is fetched before the response starts, so query errors still
+    reach the view's error handling; later failures can only cut the body short.
+    Each batch is encoded with the app's JSON provider, so rows look exactly as
+    they would through jsonify.
+    """
+    batches = iter(batches)
+    first = next(batches, [])
+    
+    def encode(rows):
+        # "[a,b]" -> "a,b" so consecutive batches join into one array
+        return current_app.json.dumps(rows, separators=(',', ':'))[1:-1]
+    
+    def generate():
+        try:
+            yield f"{prefix}[{encode(first)}"
+            written = bool(first)
+            for rows in batches:
+                yield f"{',' if written else ''}{encode(rows)}"
+                written = True
+            yield f"]{suffix}\n"
+        except Exception as e:
+            print(f"Streamed response error: {e}")
+            raise
+    
+    response = Response(stream_with_context(generate()), mimetype='application/json', headers=headers)
+    # Release the cursor's connection even if the client goes away mid-stream
+    if hasattr(batches, 'close'):
+        response.call_on_close(batches.close)
+    return response
@@ -0,0 +1,89 @@
+"""Email outbox worker
+
+Delivers emails queued in the email_outbox table by the API, retrying
+failures with exponential backoff. Run it as a separate process:
+
+    python -m backend.workers.email_worker
+"""
+
+import os
+import signal
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from prometheus_client import start_http_server
+from backend.config.config import Config
+from backend.models.email_outbox import EmailOutbox
+from backend.utils.email_service import SMTPSession, deliver_email
+
+running = True
+
+def stop(signum, frame):
+    """Finish the current batch, then exit"""
+    global running
+    running = False
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base ... capped at EMAIL_RETRY_MAX_SECONDS"""
+    return min(Config.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), Config.EMAIL_RETRY_MAX_SECONDS)
+
+def process_batch(smtp):
+    """Deliver one batch of due emails over `smtp`, returning how many were claimed"""
+    exhausted = EmailOutbox.fail_exhausted(Config.EMAIL_MAX_ATTEMPTS)
+    if exhausted:
+        print(f"✗ {exhausted} email(s) failed permanently: attempts used up without finishing")
+    
+    emails = EmailOutbox.claim_batch(Config.EMAIL_WORKER_BATCH_SIZE, Config.EMAIL_WORKER_LEASE_SECONDS,
+                                     Config.EMAIL_MAX_ATTEMPTS)
+    
+    for email in emails:
+        try:
+            deliver_email(email['recipient'], email['subject'], email['body_text'], email['body_html'],
+                          smtp=smtp)
+            if EmailOutbox.mark_sent(email['email_id'], email['attempts']):
+                print(f"✓ Email {email['email_id']} sent to {email['recipient']}")
+            else:
+                print(f"Email {email['email_id']} sent after its lease expired; it may be delivered twice")
+        except Exception as e:
+            if email['attempts'] >= Config.EMAIL_MAX_ATTEMPTS:
+                EmailOutbox.mark_failed(email['email_id'], email['attempts'], str(e))
+                print(f"✗ Email {email['email_id']} to {email['recipient']} failed permanently: {e}")
+            else:
+                delay = retry_delay(email['attempts'])
+                EmailOutbox.mark_failed(email['email_id'], email['attempts'], str(e), retry_in_seconds=delay)
+                print(f"Email {email['email_id']} attempt {email['attempts']} failed, retrying in {delay}s: {e}")
+    
+    return len(emails)
+
+def run(app):
+    """Poll the outbox until stopped"""
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    # The worker runs outside gunicorn, so it serves its own metrics (send durations, failures)
+    if Config.EMAIL_WORKER_METRICS_PORT:
+        start_http_server(Config.EMAIL_WORKER_METRICS_PORT)
+    
+    print(f"Email worker started (batch size {Config.EMAIL_WORKER_BATCH_SIZE})")
+    # One SMTP connection is reused across batches instead of one per email
+    with app.app_context(), SMTPSession() as smtp:
+        while running:
+            try:
+                claimed = process_batch(smtp)
+            except Exception as e:
+                print(f"Email worker error: {e}")
+                claimed = 0
+            
+            # Keep draining while there is a backlog; otherwise wait for new mail
+            if not claimed:
+                if smtp.idle_too_long():
+                    smtp.close()
+                time.sleep(Config.EMAIL_WORKER_POLL_INTERVAL)
+    print("Email worker stopped")
+
+if __name__ == '__main__':
+    from backend.app import app
+    run(app)
@@ -0,0 +1,103 @@
+"""Background job worker
+
+Runs jobs queued in the jobs table (see backend.utils.jobs), up to
+JOB_WORKER_CONCURRENCY at a time, retrying failures with exponential backoff.
+Run it as a separate process; several can share the table:
+
+    python -m backend.workers.job_worker
+"""
+
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from backend.config.config import Config
+from backend.config.database import Database
+from backend.models.job import Job
+from backend.utils.jobs import handlers
+import backend.workers.tasks  # registers the handlers
+
+running = True
+
+def stop(signum, frame):
+    """Finish the running jobs, then exit"""
+    global running
+    running = False
+
+class LeaseLost(Exception):
+    """The job's lease expired and another run claimed it; this run's work is discarded"""
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base ... capped at JOB_RETRY_MAX_SECONDS"""
+    return min(Config.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), Config.JOB_RETRY_MAX_SECONDS)
+
+def execute(app, job):
+    """Run one claimed job and record the outcome"""
+    try:
+        handler = handlers.get(job['job_type'])
+        if handler is None:
+            raise LookupError(f"No handler for job type '{job['job_type']}'")
+        
+        with app.app_context():
+            # The handler's writes and the done mark commit together, and only
+            # if this run still holds the job's lease
+            with Database.transaction() as conn:
+                handler(job['payload'], conn)
+                if not Job.mark_done(job['job_id'], job['attempts'], conn=conn):
+                    raise LeaseLost()
+        print(f"✓ Job {job['job_id']} ({job['job_type']}) done")
+    except LeaseLost:
+        print(f"Job {job['job_id']} ({job['job_type']}) outlived its lease and was claimed again; "
+              f"this run was rolled back")
+    except Exception as e:
+        if job['attempts'] >= job['max_attempts']:
+            Job.mark_failed(job['job_id'], job['attempts'], str(e))
+            print(f"✗ Job {job['job_id']} ({job['job_type']}) failed permanently: {e}")
+        else:
+            delay = retry_delay(job['attempts'])
+            Job.mark_failed(job['job_id'], job['attempts'], str(e), retry_in_seconds=delay)
+            print(f"Job {job['job_id']} ({job['job_type']}) attempt {job['attempts']} failed, "
+                  f"retrying in {delay}s: {e}")
+
+def run(app):
+    """Claim and run jobs until stopped"""
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    concurrency = Config.JOB_WORKER_CONCURRENCY
+    print(f"Job worker started (concurrency {concurrency}, handlers: {', '.join(sorted(handlers))})")
+    in_flight = set()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while running:
+            in_flight = {future for future in in_flight if not future.done()}
+            
+            # Wait for a free slot before claiming, so no claimed job waits in the pool while its lease runs
+            if len(in_flight) >= concurrency:
+                wait(in_flight, timeout=Config.JOB_WORKER_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                continue
+            
+            try:
+                for job in Job.fail_exhausted():
+                    print(f"✗ Job {job['job_id']} ({job['job_type']}) failed permanently: "
+                          f"attempts used up without finishing")
+                claimed = Job.claim_batch(concurrency - len(in_flight), Config.JOB_LEASE_SECONDS)
+            except Exception as e:
+                print(f"Job worker error: {e}")
+                claimed = []
+            
+            for job in claimed:
+                in_flight.add(pool.submit(execute, app, job))
+            
+            # Keep claiming while there is a backlog; otherwise wait for new jobs
+            if not claimed:
+                time.sleep(Config.JOB_WORKER_POLL_INTERVAL)
+    print("Job worker stopped")
+
+if __name__ == '__main__':
+    from backend.app import app
+    run(app)
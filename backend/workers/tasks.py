@@ -0,0 +1,66 @@
+"""Job handlers run by the job worker (see backend.utils.jobs)"""
+
+from backend.models.concern import Concern
+from backend.models.category import Notification
+from backend.models.user import User
+from backend.utils.jobs import job
+from backend.utils.email_service import (
+    send_concern_created_email,
+    send_comment_notification_email
+)
+
+@job('concern_created')
+def notify_concern_created(payload, conn):
+    """Confirm a new concern to its student (in-app and, unless anonymous, by email)"""
+    concern = Concern.find_by_id(payload['concern_id'], conn=conn)
+    if not concern:
+        return  # deleted before the job ran
+    
+    Notification.create(
+        user_id=concern['student_id'],
+        concern_id=concern['concern_id'],
+        notification_type='concern_created',
+        title='Concern Received',
+        message=f'Your concern {concern["ticket_number"]} has been received and is being reviewed.',
+        conn=conn
+    )
+    
+    if not concern['is_anonymous']:
+        send_concern_created_email(
+            concern['student_email'],
+            concern['student_name'],
+            concern['ticket_number'],
+            concern['title'],
+            conn=conn
+        )
+
+@job('comment_added')
+def notify_comment_added(payload, conn):
+    """Tell the other party (student or assigned admin) about a new comment"""
+    concern = Concern.find_by_id(payload['concern_id'], conn=conn)
+    notify_user = User.find_by_id(payload['notify_user_id'], conn=conn)
+    if not concern or not notify_user:
+        return
+    
+    Notification.create(
+        user_id=notify_user['user_id'],
+        concern_id=concern['concern_id'],
+        notification_type='comment_added',
+        title='New Comment',
+        message=f'A new comment has been added to concern {concern["ticket_number"]}.',
+        conn=conn
+    )
+    
+    # Only students are emailed (comments from admins)
+    if payload['email']:
+        commenter = User.find_by_id(payload['commenter_id'], conn=conn)
+        commenter_name = f"{commenter['first_name']} {commenter['last_name']}" if commenter else "Unknown"
+        send_comment_notification_email(
+            notify_user['email'],
+            f"{notify_user['first_name']} {notify_user['last_name']}",
+            concern['ticket_number'],
+            concern['title'],
+            commenter_name,
+            payload['comment_text'],
+            conn=conn
+        )
@@ -0,0 +1,34 @@
+-- ============================================
+-- Migration: shared cache versions
+-- Writers bump a row here in their own transaction so every worker process
+-- drops its cached copy (enable with CACHE_SHARED=True). Categories and
+-- offices are bumped by triggers, so edits made outside the API count too
+-- (checked by default, see REFERENCE_CACHE_SHARED).
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_table_cache_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO cache_versions (name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_concern_categories_cache_version ON concern_categories;
+DROP TRIGGER IF EXISTS trigger_offices_cache_version ON offices;
+
+CREATE TRIGGER trigger_concern_categories_cache_version
+AFTER INSERT OR UPDATE OR DELETE ON concern_categories
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_cache_version();
+
+CREATE TRIGGER trigger_offices_cache_version
+AFTER INSERT OR UPDATE OR DELETE ON offices
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_cache_version();
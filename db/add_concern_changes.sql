@@ -0,0 +1,34 @@
+-- ============================================
+-- Migration: delta sync for concerns
+-- GET /api/concerns/changes reads concerns by updated_at and deletions from
+-- concern_tombstones, which a trigger fills on every delete (including the
+-- cascade when a user is deleted).
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_concerns_updated_at ON concerns(updated_at);
+
+CREATE TABLE IF NOT EXISTS concern_tombstones (
+    concern_id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_concern_tombstones_deleted_at ON concern_tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION record_concern_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO concern_tombstones (concern_id, student_id)
+    SELECT concern_id, student_id FROM deleted_concerns
+    ON CONFLICT (concern_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_concern_tombstones ON concerns;
+
+CREATE TRIGGER trigger_concern_tombstones
+AFTER DELETE ON concerns
+REFERENCING OLD TABLE AS deleted_concerns
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_concern_tombstones();
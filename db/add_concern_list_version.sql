@@ -0,0 +1,55 @@
+-- ============================================
+-- Migration: concern list version
+-- The ETag of GET /api/concerns is built from the list's row count, newest
+-- updated_at and newest tombstone, which need no writer to take a shared
+-- lock. Renames of the names the list shows (students, categories, offices)
+-- do not touch concerns, so these triggers bump cache_versions row
+-- 'concern_names' when one actually changes. Concern writes bump nothing, so
+-- they never wait on each other here.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+-- Earlier version of this migration bumped a single row on every concern write
+DROP TRIGGER IF EXISTS trigger_concern_list_version ON concerns;
+DROP TRIGGER IF EXISTS trigger_concern_list_version_users ON users;
+DROP TRIGGER IF EXISTS trigger_concern_list_version_categories ON concern_categories;
+DROP TRIGGER IF EXISTS trigger_concern_list_version_offices ON offices;
+DROP FUNCTION IF EXISTS bump_concern_list_version();
+DELETE FROM cache_versions WHERE name = 'concern_list';
+
+CREATE OR REPLACE FUNCTION bump_concern_names_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO cache_versions (name, version) VALUES ('concern_names', 1)
+    ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_concern_names_version_users ON users;
+DROP TRIGGER IF EXISTS trigger_concern_names_version_categories ON concern_categories;
+DROP TRIGGER IF EXISTS trigger_concern_names_version_offices ON offices;
+
+CREATE TRIGGER trigger_concern_names_version_users
+AFTER UPDATE OF first_name, last_name, sr_code ON users
+FOR EACH ROW
+WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name
+      OR OLD.last_name IS DISTINCT FROM NEW.last_name
+      OR OLD.sr_code IS DISTINCT FROM NEW.sr_code)
+EXECUTE FUNCTION bump_concern_names_version();
+
+CREATE TRIGGER trigger_concern_names_version_categories
+AFTER UPDATE OF category_name ON concern_categories
+FOR EACH ROW
+WHEN (OLD.category_name IS DISTINCT FROM NEW.category_name)
+EXECUTE FUNCTION bump_concern_names_version();
+
+CREATE TRIGGER trigger_concern_names_version_offices
+AFTER UPDATE OF office_name ON offices
+FOR EACH ROW
+WHEN (OLD.office_name IS DISTINCT FROM NEW.office_name)
+EXECUTE FUNCTION bump_concern_names_version();
@@ -0,0 +1,4 @@
+-- Composite indexes for keyset pagination of concern lists
+-- (ORDER BY created_at DESC, concern_id DESC with a (created_at, concern_id) < (...) cursor)
+CREATE INDEX IF NOT EXISTS idx_concerns_created_at_id ON concerns(created_at DESC, concern_id DESC);
+CREATE INDEX IF NOT EXISTS idx_concerns_student_created_at_id ON concerns(student_id, created_at DESC, concern_id DESC);
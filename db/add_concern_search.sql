@@ -0,0 +1,16 @@
+-- ============================================
+-- Migration: full-text search over concerns
+-- Generated tsvector kept up to date by Postgres on every insert/update,
+-- indexed with GIN for GET /api/concerns?q=...
+-- Rewrites the concerns table once to fill the column.
+-- ============================================
+
+ALTER TABLE concerns ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', COALESCE(ticket_number, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(location, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_concerns_search_vector ON concerns USING GIN (search_vector);
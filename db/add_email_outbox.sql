@@ -0,0 +1,23 @@
+-- ============================================
+-- Migration: email outbox
+-- Emails are queued in the same transaction as the change they report and
+-- delivered by `python -m backend.workers.email_worker`.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    email_id SERIAL PRIMARY KEY,
+    recipient VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    body_text TEXT NOT NULL,
+    body_html TEXT,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+-- Only pending rows are polled, so keep the index small
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox(next_attempt_at) WHERE status = 'pending';
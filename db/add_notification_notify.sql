@@ -0,0 +1,23 @@
+-- ============================================
+-- Migration: push notifications via LISTEN/NOTIFY
+-- Every new notification is announced on the 'notifications' channel so the
+-- SSE stream and long-poll endpoints can wake up without polling the table.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION notify_new_notification()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('notifications', json_build_object(
+        'notification_id', NEW.notification_id,
+        'user_id', NEW.user_id
+    )::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_notify_new_notification ON notifications;
+
+CREATE TRIGGER trigger_notify_new_notification
+AFTER INSERT ON notifications
+FOR EACH ROW
+EXECUTE FUNCTION notify_new_notification();
@@ -0,0 +1,52 @@
+-- ============================================
+-- Migration: per-year ticket counters
+-- Replaces the COUNT(*)-based generate_ticket_number() trigger function,
+-- which scanned concerns on every insert and handed out duplicate numbers
+-- to concurrent inserts.
+-- ============================================
+
+BEGIN;
+
+-- Block concern inserts while the counters are seeded
+LOCK TABLE concerns IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TABLE IF NOT EXISTS ticket_counters (
+    year INTEGER PRIMARY KEY,
+    last_number INTEGER NOT NULL
+);
+
+-- Seed each year's counter from the highest GRV-YYYY-NNNNN already issued
+INSERT INTO ticket_counters (year, last_number)
+SELECT SPLIT_PART(ticket_number, '-', 2)::INTEGER,
+       MAX(SPLIT_PART(ticket_number, '-', 3)::INTEGER)
+FROM concerns
+WHERE ticket_number ~ '^GRV-[0-9]{4}-[0-9]+$'
+GROUP BY 1
+ON CONFLICT (year) DO UPDATE
+SET last_number = GREATEST(ticket_counters.last_number, EXCLUDED.last_number);
+
+CREATE OR REPLACE FUNCTION generate_ticket_number()
+RETURNS TRIGGER AS $$
+DECLARE
+    year_part INTEGER;
+    seq_number INTEGER;
+BEGIN
+    year_part := EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER;
+    
+    -- Upsert takes a row lock on the year's counter, so concurrent inserts
+    -- get distinct numbers and the cost does not grow with the table
+    INSERT INTO ticket_counters (year, last_number)
+    VALUES (year_part, 1)
+    ON CONFLICT (year) DO UPDATE SET last_number = ticket_counters.last_number + 1
+    RETURNING last_number INTO seq_number;
+    
+    NEW.ticket_number := 'GRV-' || year_part || '-' ||
+        LPAD(seq_number::TEXT, GREATEST(5, LENGTH(seq_number::TEXT)), '0');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
+
+-- Verify
+SELECT * FROM ticket_counters ORDER BY year;
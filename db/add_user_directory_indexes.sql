@@ -0,0 +1,8 @@
+-- ============================================
+-- Migration: user directory indexes
+-- Keyset pages of GET /api/users (?sort=name / ?sort=created_at) walk these
+-- instead of sorting every active user.
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_users_directory_name ON users(last_name, first_name, user_id) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_users_directory_created_at ON users(created_at DESC, user_id DESC) WHERE is_active;
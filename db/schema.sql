@@ -4,11 +4,16 @@
 -- ============================================
 
 -- Drop tables if they exist (in reverse order of dependencies)
+DROP TABLE IF EXISTS jobs CASCADE;
+DROP TABLE IF EXISTS email_outbox CASCADE;
 DROP TABLE IF EXISTS attachments CASCADE;
 DROP TABLE IF EXISTS notifications CASCADE;
 DROP TABLE IF EXISTS comments CASCADE;
 DROP TABLE IF EXISTS concern_status_history CASCADE;
 DROP TABLE IF EXISTS concerns CASCADE;
+DROP TABLE IF EXISTS ticket_counters CASCADE;
+DROP TABLE IF EXISTS cache_versions CASCADE;
+DROP TABLE IF EXISTS concern_tombstones CASCADE;
 DROP TABLE IF EXISTS offices CASCADE;
 DROP TABLE IF EXISTS concern_categories CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
@@ -37,6 +42,8 @@ CREATE INDEX idx_users_sr_code ON users(sr_code);
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_role ON users(role);
 CREATE INDEX idx_users_google_id ON users(google_id);
+CREATE INDEX idx_users_directory_name ON users(last_name, first_name, user_id) WHERE is_active;
+CREATE INDEX idx_users_directory_created_at ON users(created_at DESC, user_id DESC) WHERE is_active;
 
 -- ============================================
 -- TABLE: concern_categories
@@ -108,6 +115,14 @@ CREATE TABLE concerns (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
+    -- Full-text search document (ticket number and title weigh most)
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', COALESCE(ticket_number, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(location, '')), 'C')
+    ) STORED,
+    
     FOREIGN KEY (student_id) REFERENCES users(user_id) ON DELETE CASCADE,
     FOREIGN KEY (category_id) REFERENCES concern_categories(category_id),
     FOREIGN KEY (assigned_office_id) REFERENCES offices(office_id),
@@ -120,6 +135,10 @@ CREATE INDEX idx_concerns_status ON concerns(status);
 CREATE INDEX idx_concerns_category_id ON concerns(category_id);
 CREATE INDEX idx_concerns_ticket_number ON concerns(ticket_number);
 CREATE INDEX idx_concerns_created_at ON concerns(created_at);
+CREATE INDEX idx_concerns_created_at_id ON concerns(created_at DESC, concern_id DESC);
+CREATE INDEX idx_concerns_student_created_at_id ON concerns(student_id, created_at DESC, concern_id DESC);
+CREATE INDEX idx_concerns_search_vector ON concerns USING GIN (search_vector);
+CREATE INDEX idx_concerns_updated_at ON concerns(updated_at);
 
 -- ============================================
 -- TABLE: concern_status_history
@@ -202,25 +221,98 @@ CREATE TABLE attachments (
 
 CREATE INDEX idx_attachments_concern_id ON attachments(concern_id);
 
+-- ============================================
+-- TABLE: email_outbox
+-- ============================================
+-- Emails queued with the change they report, delivered by the email worker
+CREATE TABLE email_outbox (
+    email_id SERIAL PRIMARY KEY,
+    recipient VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    body_text TEXT NOT NULL,
+    body_html TEXT,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+CREATE INDEX idx_email_outbox_due ON email_outbox(next_attempt_at) WHERE status = 'pending';
+
+-- ============================================
+-- TABLE: jobs
+-- ============================================
+-- Deferred work queued with the change it follows up, run by the job worker
+CREATE TABLE jobs (
+    job_id BIGSERIAL PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}',
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- next attempt, or lease expiry while running
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX idx_jobs_due ON jobs(run_at) WHERE status = 'pending';
+
+-- ============================================
+-- TABLE: ticket_counters
+-- ============================================
+-- Last ticket number issued per year; replaces counting the concerns table
+CREATE TABLE ticket_counters (
+    year INTEGER PRIMARY KEY,
+    last_number INTEGER NOT NULL
+);
+
+-- ============================================
+-- TABLE: concern_tombstones
+-- ============================================
+-- Deleted concerns, for clients syncing with GET /api/concerns/changes
+CREATE TABLE concern_tombstones (
+    concern_id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_concern_tombstones_deleted_at ON concern_tombstones(deleted_at);
+
+-- ============================================
+-- TABLE: cache_versions
+-- ============================================
+-- Bumped by writers so every worker drops its cached copy (CACHE_SHARED=True);
+-- triggers bump the concern_categories and offices rows (REFERENCE_CACHE_SHARED)
+CREATE TABLE cache_versions (
+    name VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
 -- ============================================
 -- FUNCTION: Generate Ticket Number
 -- ============================================
 CREATE OR REPLACE FUNCTION generate_ticket_number()
 RETURNS TRIGGER AS $$
 DECLARE
-    year_part VARCHAR(4);
+    year_part INTEGER;
     seq_number INTEGER;
-    new_ticket VARCHAR(50);
 BEGIN
-    year_part := TO_CHAR(CURRENT_DATE, 'YYYY');
+    year_part := EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER;
     
-    SELECT COUNT(*) + 1 INTO seq_number
-    FROM concerns
-    WHERE EXTRACT(YEAR FROM created_at) = EXTRACT(YEAR FROM CURRENT_DATE);
+    -- Upsert takes a row lock on the year's counter, so concurrent inserts
+    -- get distinct numbers and the cost does not grow with the table
+    INSERT INTO ticket_counters (year, last_number)
+    VALUES (year_part, 1)
+    ON CONFLICT (year) DO UPDATE SET last_number = ticket_counters.last_number + 1
+    RETURNING last_number INTO seq_number;
     
-    new_ticket := 'GRV-' || year_part || '-' || LPAD(seq_number::TEXT, 5, '0');
-    
-    NEW.ticket_number := new_ticket;
+    NEW.ticket_number := 'GRV-' || year_part || '-' ||
+        LPAD(seq_number::TEXT, GREATEST(5, LENGTH(seq_number::TEXT)), '0');
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
@@ -264,26 +356,108 @@ FOR EACH ROW
 EXECUTE FUNCTION update_updated_at_column();
 
 -- ============================================
--- FUNCTION: Log status changes
+-- FUNCTION: Announce new notifications (LISTEN/NOTIFY)
 -- ============================================
-CREATE OR REPLACE FUNCTION log_status_change()
+CREATE OR REPLACE FUNCTION notify_new_notification()
 RETURNS TRIGGER AS $$
 BEGIN
-    IF (TG_OP = 'UPDATE' AND OLD.status != NEW.status) THEN
-        INSERT INTO concern_status_history (concern_id, old_status, new_status, changed_by, remarks)
-        VALUES (NEW.concern_id, OLD.status, NEW.status, NEW.assigned_admin_id, 'Status updated');
-    END IF;
+    PERFORM pg_notify('notifications', json_build_object(
+        'notification_id', NEW.notification_id,
+        'user_id', NEW.user_id
+    )::text);
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
 -- ============================================
--- TRIGGER: Auto-log status changes
+-- TRIGGER: Push new notifications to listeners
+-- ============================================
+CREATE TRIGGER trigger_notify_new_notification
+AFTER INSERT ON notifications
+FOR EACH ROW
+EXECUTE FUNCTION notify_new_notification();
+
+-- ============================================
+-- FUNCTION: Record deleted concerns
 -- ============================================
-CREATE TRIGGER trigger_log_status_change
-AFTER UPDATE ON concerns
+CREATE OR REPLACE FUNCTION record_concern_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO concern_tombstones (concern_id, student_id)
+    SELECT concern_id, student_id FROM deleted_concerns
+    ON CONFLICT (concern_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- TRIGGER: Tombstones for deleted concerns (one insert per statement)
+-- ============================================
+CREATE TRIGGER trigger_concern_tombstones
+AFTER DELETE ON concerns
+REFERENCING OLD TABLE AS deleted_concerns
+FOR EACH STATEMENT
+EXECUTE FUNCTION record_concern_tombstones();
+
+-- ============================================
+-- FUNCTION: Bump a reference table's cache version (row named after the table)
+-- ============================================
+CREATE OR REPLACE FUNCTION bump_table_cache_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO cache_versions (name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- TRIGGERS: Category and office edits, including ones made outside the API
+-- ============================================
+CREATE TRIGGER trigger_concern_categories_cache_version
+AFTER INSERT OR UPDATE OR DELETE ON concern_categories
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_cache_version();
+
+CREATE TRIGGER trigger_offices_cache_version
+AFTER INSERT OR UPDATE OR DELETE ON offices
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_cache_version();
+
+-- ============================================
+-- FUNCTION: Bump the concern names version (part of the GET /api/concerns ETag)
+-- ============================================
+CREATE OR REPLACE FUNCTION bump_concern_names_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO cache_versions (name, version) VALUES ('concern_names', 1)
+    ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- TRIGGERS: Renames of the names concern lists show
+-- ============================================
+CREATE TRIGGER trigger_concern_names_version_users
+AFTER UPDATE OF first_name, last_name, sr_code ON users
+FOR EACH ROW
+WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name
+      OR OLD.last_name IS DISTINCT FROM NEW.last_name
+      OR OLD.sr_code IS DISTINCT FROM NEW.sr_code)
+EXECUTE FUNCTION bump_concern_names_version();
+
+CREATE TRIGGER trigger_concern_names_version_categories
+AFTER UPDATE OF category_name ON concern_categories
+FOR EACH ROW
+WHEN (OLD.category_name IS DISTINCT FROM NEW.category_name)
+EXECUTE FUNCTION bump_concern_names_version();
+
+CREATE TRIGGER trigger_concern_names_version_offices
+AFTER UPDATE OF office_name ON offices
 FOR EACH ROW
-EXECUTE FUNCTION log_status_change();
+WHEN (OLD.office_name IS DISTINCT FROM NEW.office_name)
+EXECUTE FUNCTION bump_concern_names_version();
 
 -- ============================================
 -- Sample Data (For Testing)
@@ -0,0 +1,21 @@
+"""Gunicorn settings (read automatically from the working directory)"""
+
+import os
+import shutil
+import tempfile
+
+# Every worker writes its Prometheus samples here and /metrics adds them up.
+# Must be set before prometheus_client is imported, so it is not imported at
+# the top of this file (the master would otherwise fork workers without it).
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR',
+                                    os.path.join(tempfile.gettempdir(), 'ssc-grievance-metrics'))
+
+def on_starting(server):
+    """Start from an empty metrics directory so old runs are not counted"""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges (its counters and histograms are kept)"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,3 +1,15 @@
 # Activate virtual environment and run Flask app
 .\venv\Scripts\Activate.ps1
-python backend/app.py
+
+# Background workers: queued jobs (notifications) and the email outbox.
+# Without them set JOB_USE_WORKER=False and EMAIL_USE_OUTBOX=False in .env
+$workers = @(
+    Start-Process python -ArgumentList '-m', 'backend.workers.job_worker' -NoNewWindow -PassThru
+    Start-Process python -ArgumentList '-m', 'backend.workers.email_worker' -NoNewWindow -PassThru
+)
+
+try {
+    python backend/app.py
+} finally {
+    $workers | Stop-Process -ErrorAction SilentlyContinue
+}
@@ -0,0 +1,57 @@
+"""Measure email rendering cost per message
+
+Compiles the email templates (the one-off cost paid at startup by
+precompile()), then renders each email many times with varied, escape-heavy
+user text and prints the cost per message, text and HTML together:
+
+    python scripts/bench_email_render.py [messages]
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.email_templates import precompile, render_email
+
+def contexts(count):
+    """Per-recipient template variables, including text that needs escaping"""
+    for i in range(count):
+        yield {
+            'name': f'Juan Dela Cruz #{i}',
+            'ticket_number': f'GRV-2025-{i:05d}',
+            'title': f'Broken fan in room {i % 400} & no <lights>',
+            'old_status': 'pending',
+            'new_status': 'in-progress',
+            'remarks': 'Forwarded to "General Services" <gso@batstate-u.edu.ph>\nExpect a visit this week.',
+            'resolution_notes': 'Fan replaced & wiring checked.',
+            'commenter_name': 'SSC Admin',
+            'comment_text': '<b>Update:</b> the technician is scheduled for Monday.\nPlease keep the room open.',
+            'office_name': 'General Services',
+            'code': f'{i % 1000000:06d}',
+            'verification_link': f'https://ssc.example.edu/verify-email?token={i:064d}'
+        }
+
+TEMPLATES = ['concern_created', 'status_update', 'concern_resolved', 'comment_added',
+             'concern_assigned', 'verification_code', 'verification_link']
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    started = time.perf_counter()
+    precompile()
+    print(f"compile all templates (once per process): {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    messages = list(contexts(count))
+    print(f"render, {count} messages each:")
+    for template in TEMPLATES:
+        started = time.perf_counter()
+        for context in messages:
+            render_email(template, **context)
+        elapsed = time.perf_counter() - started
+        print(f"  {template:<18} {elapsed / count * 1e6:7.1f} µs/message")
+
+if __name__ == '__main__':
+    main()
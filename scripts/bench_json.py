@@ -0,0 +1,79 @@
+"""Benchmark JSON serialization of a large concern list (default vs orjson provider)
+
+Builds rows shaped like Concern.get_all() results, serializes them through
+each provider's response() the way jsonify does, checks both bodies decode to
+the same value and prints the timings. No database needed:
+
+    python scripts/bench_json.py [rows] [repeat]
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from backend.utils.json_provider import OrjsonProvider
+
+STATUSES = ['pending', 'in-review', 'in-progress', 'resolved', 'closed', 'rejected']
+
+def make_rows(count):
+    """Synthetic concern rows with the same columns and value types as the list endpoint"""
+    start = datetime(2025, 6, 1, 8, 0, 0)
+    return [{
+        'concern_id': i,
+        'ticket_number': f'GRV-2025-{i:05d}',
+        'title': f'Concern #{i}: broken ceiling fan in room {i % 400}',
+        'description': 'The ceiling fan has not worked since the start of the semester. ' * 3,
+        'status': STATUSES[i % len(STATUSES)],
+        'priority': 'normal',
+        'created_at': start + timedelta(minutes=i),
+        'updated_at': start + timedelta(minutes=i, seconds=30),
+        'is_anonymous': i % 7 == 0,
+        'location': f'Building {i % 5}, Room {i % 400}',
+        'incident_date': date(2025, 5, 1) + timedelta(days=i % 30),
+        'category_id': i % 5 + 1,
+        'assigned_office_id': i % 4 + 1 if i % 3 else None,
+        'student_id': i % 900 + 2,
+        'student_name': 'Juan Dela Cruz — BSIT',
+        'sr_code': f'21-{i:05d}',
+        'category_name': 'Facilities',
+        'office_name': 'General Services' if i % 3 else None,
+        'rank': Decimal('0.0607927') if i % 2 else None
+    } for i in range(count)]
+
+def bench(provider, payload, repeat):
+    """Best-of-`repeat` seconds to build the response body"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = provider.response(payload).get_data()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    
+    app = Flask(__name__)
+    payload = {'concerns': make_rows(rows), 'total': rows, 'next_cursor': None}
+    
+    with app.app_context():
+        default_time, default_body = bench(DefaultJSONProvider(app), payload, repeat)
+        orjson_time, orjson_body = bench(OrjsonProvider(app), payload, repeat)
+    
+    assert json.loads(default_body) == json.loads(orjson_body), "providers disagree"
+    
+    print(f"{rows} rows, best of {repeat}")
+    print(f"  default: {default_time * 1000:8.1f} ms  {len(default_body) / 1024:8.0f} KiB")
+    print(f"  orjson:  {orjson_time * 1000:8.1f} ms  {len(orjson_body) / 1024:8.0f} KiB")
+    print(f"  speedup: {default_time / orjson_time:.1f}x (identical decoded output)")
+
+if __name__ == '__main__':
+    main()
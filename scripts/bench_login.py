@@ -0,0 +1,93 @@
+"""Benchmark password checks under a login burst, and calibrate the bcrypt cost
+
+Simulates a burst of logins arriving on many request threads (like gthread
+workers) while other, cheap requests keep coming in. Compares bcrypt run
+inline on every request thread with the bounded hash pool in
+backend.utils.auth, and prints login throughput and latency, logins shed
+with 503 once BCRYPT_MAX_QUEUE is full, and the latency of the cheap
+requests. No database needed:
+
+    python scripts/bench_login.py [logins] [threads]
+    python scripts/bench_login.py --calibrate [target_ms]
+
+--calibrate times each cost factor on this machine and prints the
+BCRYPT_ROUNDS that keeps one hash under target_ms (default 250).
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bcrypt
+from backend.config.config import Config
+from backend.utils.auth import PasswordHasherBusy, calibrate_rounds, hash_password, verify_password
+
+PASSWORD = 'correct horse battery staple'
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def cheap_requests(stop, latencies):
+    """Stand-in for other API requests: a little Python work every 10 ms"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        sum(i * i for i in range(2000))
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.01)
+
+def burst(check, hashed, logins, threads):
+    """Run `logins` password checks from `threads` request threads"""
+    def login(_):
+        started = time.perf_counter()
+        try:
+            assert check(PASSWORD.encode() if check is bcrypt.checkpw else PASSWORD, hashed)
+        except PasswordHasherBusy:
+            return None  # answered 503 straight away
+        return time.perf_counter() - started
+    
+    stop, other = threading.Event(), []
+    background = threading.Thread(target=cheap_requests, args=(stop, other))
+    background.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as request_threads:
+        results = list(request_threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    background.join()
+    latencies = [latency for latency in results if latency is not None]
+    return len(latencies) / elapsed, latencies, logins - len(latencies), other
+
+def calibrate(target_ms):
+    print(f"bcrypt cost on this machine (target {target_ms:.0f} ms per hash):")
+    for rounds in range(10, 15):
+        started = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(rounds))
+        print(f"  {rounds}: {(time.perf_counter() - started) * 1000:7.1f} ms")
+    print(f"BCRYPT_ROUNDS={calibrate_rounds(target_ms)}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--calibrate':
+        calibrate(float(sys.argv[2]) if len(sys.argv) > 2 else 250)
+        return
+    
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    hashed = hash_password(PASSWORD)
+    
+    print(f"{logins} logins from {threads} request threads, cost {Config.BCRYPT_ROUNDS}, "
+          f"{os.cpu_count()} CPUs, pool of {Config.BCRYPT_WORKERS}")
+    for name, check, stored in [('inline bcrypt', bcrypt.checkpw, hashed.encode()),
+                                ('hash pool', verify_password, hashed)]:
+        throughput, latencies, rejected, other = burst(check, stored, logins, threads)
+        print(f"  {name:<13} {throughput:6.1f} logins/s  login p50 {percentile(latencies, .5) * 1000:6.0f} ms"
+              f"  p95 {percentile(latencies, .95) * 1000:6.0f} ms  503s {rejected:3d}"
+              f"  | other requests p95 {percentile(other, .95) * 1000:6.1f} ms")
+
+if __name__ == '__main__':
+    main()
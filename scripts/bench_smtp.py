@@ -0,0 +1,84 @@
+"""Benchmark email delivery: one SMTP connection per message vs a reused SMTPSession
+
+Starts a local aiosmtpd sink that accepts and discards mail (delaying each
+reply by `latency_ms` to mimic the round trips to a remote server),
+points Flask-Mail at it and sends the same messages both ways. No real mail
+server needed; aiosmtpd is a dev-only dependency:
+
+    pip install aiosmtpd
+    python scripts/bench_smtp.py [messages] [latency_ms]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP
+from flask import Flask
+from backend.utils.email_service import SMTPSession, deliver_email, init_mail
+
+class SlowSMTP(SMTP):
+    """aiosmtpd server that waits `latency` seconds before each reply, like a network round trip"""
+    
+    latency = 0
+    
+    async def push(self, status):
+        await asyncio.sleep(self.latency)
+        await super().push(status)
+
+class Sink:
+    """Counts delivered messages"""
+    
+    def __init__(self):
+        self.received = 0
+    
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 OK'
+
+class SinkController(Controller):
+    def factory(self):
+        return SlowSMTP(self.handler)
+
+def send_all(count, smtp=None):
+    started = time.perf_counter()
+    for i in range(count):
+        deliver_email(f'student{i}@g.batstate-u.edu.ph', f'Status Update - GRV-2025-{i:05d}',
+                      'Your concern status has been updated.', smtp=smtp)
+    return time.perf_counter() - started
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    SlowSMTP.latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5) / 1000
+    
+    sink = Sink()
+    controller = SinkController(sink, hostname='127.0.0.1', port=8025)
+    controller.start()
+    
+    app = Flask(__name__)
+    app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=8025, MAIL_USE_TLS=False, MAIL_USE_SSL=False,
+                      MAIL_USERNAME=None, MAIL_PASSWORD=None, MAIL_DEFAULT_SENDER='ssc@batstateu.edu.ph')
+    init_mail(app)
+    
+    try:
+        with app.app_context():
+            per_message = send_all(count)
+            with SMTPSession() as smtp:
+                reused = send_all(count, smtp=smtp)
+    finally:
+        controller.stop()
+    
+    assert sink.received == 2 * count, f"sink received {sink.received} of {2 * count} messages"
+    
+    print(f"{count} messages, {SlowSMTP.latency * 1000:.0f} ms per SMTP reply")
+    print(f"  connection per message: {per_message * 1000:8.1f} ms  {count / per_message:7.1f} msg/s")
+    print(f"  reused SMTPSession:     {reused * 1000:8.1f} ms  {count / reused:7.1f} msg/s")
+    print(f"  speedup: {per_message / reused:.1f}x")
+
+if __name__ == '__main__':
+    main()
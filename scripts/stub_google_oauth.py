@@ -0,0 +1,128 @@
+"""Local stand-in for Google's OAuth endpoints, for testing Google sign-in offline
+
+Serves the three endpoints the backend talks to, signing ID tokens with a key
+generated at startup:
+
+    GET  /o/oauth2/v2/auth   redirects straight back with a code (no consent screen)
+    POST /token              exchanges the code for an access token and ID token
+    GET  /oauth2/v1/certs    the signing key, with Cache-Control max-age like Google
+
+Start it, then point the backend at it in .env:
+
+    python scripts/stub_google_oauth.py [--port 8765] [--latency-ms 0] [--certs-max-age 3600]
+
+    GOOGLE_AUTH_URL=http://localhost:8765/o/oauth2/v2/auth
+    GOOGLE_TOKEN_URL=http://localhost:8765/token
+    GOOGLE_CERTS_URL=http://localhost:8765/oauth2/v1/certs
+
+The signed-in account defaults to stub.student@g.batstate-u.edu.ph; pass
+`login_hint=<email>` to the auth URL to sign in as someone else. --latency-ms
+delays every response to mimic the round trip to Google, and the certs fetch
+count is printed so cert caching can be checked.
+"""
+
+import argparse
+import hashlib
+import os
+import secrets
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rsa
+from flask import Flask, jsonify, redirect, request
+from google.auth import crypt, jwt
+
+ISSUER = 'https://accounts.google.com'
+DEFAULT_EMAIL = 'stub.student@g.batstate-u.edu.ph'
+
+def create_stub(latency=0, certs_max_age=3600):
+    """Build the stub app with a fresh signing key"""
+    app = Flask(__name__)
+    public_key, private_key = rsa.newkeys(2048)
+    key_id = secrets.token_hex(8)
+    signer = crypt.RSASigner.from_string(private_key.save_pkcs1(), key_id)
+    codes = {}  # authorization code -> (client_id, email, nonce)
+    lock = threading.Lock()
+    stats = {'certs_fetches': 0}
+    
+    @app.before_request
+    def simulate_latency():
+        if latency:
+            time.sleep(latency)
+    
+    @app.route('/o/oauth2/v2/auth')
+    def authorize():
+        code = secrets.token_urlsafe(24)
+        with lock:
+            codes[code] = (request.args.get('client_id', ''),
+                           request.args.get('login_hint') or DEFAULT_EMAIL,
+                           request.args.get('nonce'))
+        params = {'code': code}
+        if request.args.get('state'):
+            params['state'] = request.args['state']
+        return redirect(f"{request.args['redirect_uri']}?{urlencode(params)}")
+    
+    @app.route('/token', methods=['POST'])
+    def token():
+        with lock:
+            grant = codes.pop(request.form.get('code', ''), None)
+        if grant is None or grant[0] != request.form.get('client_id'):
+            return jsonify({'error': 'invalid_grant'}), 400
+        
+        client_id, email, nonce = grant
+        local_part = email.split('@')[0]
+        given_name, _, family_name = local_part.replace('.', ' ').title().partition(' ')
+        now = int(time.time())
+        claims = {
+            'iss': ISSUER,
+            'aud': client_id,
+            'azp': client_id,
+            'sub': str(int(hashlib.sha256(email.encode()).hexdigest()[:15], 16)),
+            'email': email,
+            'email_verified': True,
+            'name': f'{given_name} {family_name}'.strip(),
+            'given_name': given_name,
+            'family_name': family_name or 'Stub',
+            'iat': now,
+            'exp': now + 3600
+        }
+        if nonce:
+            claims['nonce'] = nonce
+        
+        return jsonify({
+            'access_token': secrets.token_urlsafe(32),
+            'expires_in': 3599,
+            'token_type': 'Bearer',
+            'scope': 'openid email profile',
+            'id_token': jwt.encode(signer, claims).decode()
+        })
+    
+    @app.route('/oauth2/v1/certs')
+    def certs():
+        with lock:
+            stats['certs_fetches'] += 1
+            print(f"certs fetched ({stats['certs_fetches']} so far)")
+        response = jsonify({key_id: public_key.save_pkcs1().decode()})
+        response.headers['Cache-Control'] = f'public, max-age={certs_max_age}, must-revalidate, no-transform'
+        return response
+    
+    app.stats = stats
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub Google OAuth server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help='delay added to every response')
+    parser.add_argument('--certs-max-age', type=int, default=3600, help='Cache-Control max-age for /certs')
+    args = parser.parse_args()
+    
+    app = create_stub(args.latency_ms / 1000, args.certs_max_age)
+    app.run(port=args.port, threaded=True)
+
+if __name__ == '__main__':
+    main()